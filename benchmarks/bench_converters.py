@@ -0,0 +1,51 @@
+'''
+Converter throughput benchmark
+
+Measures how quickly the tenable.reports converters can stream a .nessus file
+into each of the supported sinks, and compares that against simply walking
+the file with NessusReportv2.  A converter running at (or near) the raw parse
+rate means that the sink itself isn't the bottleneck.
+
+Usage:
+    python benchmarks/bench_converters.py example.nessus [example2.nessus ...]
+'''
+import os, shutil, sys, tempfile, time
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+from tenable.reports import NessusReportv2, to_csv, to_jsonl, to_sqlite
+
+
+def parse_only(src, dest):
+    count = 0
+    for item in NessusReportv2(src):
+        count += 1
+    return count
+
+
+def run(name, func, src, dest):
+    start = time.time()
+    count = func(src, dest)
+    elapsed = time.time() - start
+    print('{:<10} {:>10} records {:>8.2f}s {:>12.0f} records/sec'.format(
+        name, count, elapsed, count / elapsed if elapsed else 0))
+
+
+def main(paths):
+    tmpdir = tempfile.mkdtemp()
+    try:
+        for src in paths:
+            print('{} ({:.1f} MB)'.format(src, os.path.getsize(src) / 1048576.0))
+            run('parse', parse_only, src, None)
+            run('jsonl', to_jsonl, src, os.path.join(tmpdir, 'out.jsonl'))
+            run('csv', to_csv, src, os.path.join(tmpdir, 'out.csv'))
+            run('sqlite', to_sqlite, src, os.path.join(tmpdir, 'out.db'))
+            os.remove(os.path.join(tmpdir, 'out.db'))
+    finally:
+        shutil.rmtree(tmpdir)
+
+
+if __name__ == '__main__':
+    if len(sys.argv) < 2:
+        print(__doc__)
+        sys.exit(1)
+    main(sys.argv[1:])
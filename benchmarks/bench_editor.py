@@ -0,0 +1,141 @@
+'''
+EditorAPI.parse_vals benchmark
+
+Generates deterministic synthetic scan editor documents that are shaped like
+the documents returned from the editor API (settings groups, sections, inputs,
+modes, and credential/compliance listings) and compares the current
+parse_vals implementation against the original recursive dict_merge based
+version.  The output of both implementations is checked to be identical.
+
+Usage:
+    python benchmarks/bench_editor.py [--inputs 500,5000,50000] [--depth 6]
+        [--rounds 5]
+'''
+import argparse, os, random, sys, time
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+from tenable.tenable_io.editor import EditorAPI
+from tenable.utils import dict_merge
+
+TYPES = ['entry', 'checkbox', 'radio', 'select', 'file', 'password',
+         'textarea', 'medium-fixed-entry']
+
+
+def legacy_parse_vals(item):
+    '''
+    The original recursive implementation of parse_vals.
+    '''
+    resp = dict()
+    if 'id' in item and ('default' in item
+        or ('type' in item and item['type'] in [
+            'file',
+            'checkbox',
+            'entry',
+            'medium-fixed-entry'])):
+        if not 'default' in item:
+            item['default'] = ""
+        resp[item['id']] = item['default']
+
+    for key in item.keys():
+        if key == 'modes':
+            continue
+        if (isinstance(item[key], list)
+          and len(item[key]) > 0
+          and isinstance(item[key][0], dict)):
+            for i in item[key]:
+                resp = dict_merge(resp, legacy_parse_vals(i))
+        if isinstance(item[key], dict):
+            resp = dict_merge(resp, legacy_parse_vals(item[key]))
+    return resp
+
+
+def _input(rng, n):
+    '''
+    Returns a synthetic editor input.
+    '''
+    item = {
+        'id': 'setting_{}'.format(n),
+        'name': 'Setting {}'.format(n),
+        'type': rng.choice(TYPES),
+        'hint': 'hint text for setting {}'.format(n),
+        'required': rng.random() > 0.8,
+    }
+    if item['type'] in ('radio', 'select'):
+        item['options'] = ['option {}'.format(i) for i in range(5)]
+    if rng.random() > 0.3:
+        item['default'] = rng.choice(['yes', 'no', '', str(n)])
+    return item
+
+
+def generate(inputs, depth=6, seed=0):
+    '''
+    Generates a synthetic editor document containing the requested number of
+    inputs spread across nested groups up to the requested depth.
+    '''
+    rng = random.Random(seed)
+    counter = [0]
+
+    def group(level):
+        node = {
+            'name': 'Group {}'.format(level),
+            'title': 'Group at level {}'.format(level),
+            'inputs': list(),
+        }
+        # The modes sub-documents are skipped by the parser, however they can
+        # be large, so we include them to ensure they're cheap to skip.
+        node['modes'] = {'basic': {'id': 'mode', 'inputs': [
+            _input(rng, -1) for i in range(3)]}}
+        for i in range(rng.randint(2, 8)):
+            if counter[0] >= inputs:
+                break
+            node['inputs'].append(_input(rng, counter[0]))
+            counter[0] += 1
+        if level < depth:
+            node['groups'] = [group(level + 1)
+                for i in range(rng.randint(1, 3)) if counter[0] < inputs]
+        return node
+
+    doc = {'title': 'Advanced Scan', 'settings': {}}
+    sections = ['basic', 'discovery', 'assessment', 'report', 'advanced']
+    while counter[0] < inputs:
+        for section in sections:
+            if counter[0] >= inputs:
+                break
+            doc['settings'].setdefault(section, {'groups': []})
+            doc['settings'][section]['groups'].append(group(1))
+    return doc
+
+
+def timed(func, doc, rounds):
+    best = None
+    for i in range(rounds):
+        start = time.time()
+        resp = func(doc)
+        elapsed = time.time() - start
+        best = elapsed if best is None else min(best, elapsed)
+    return best, resp
+
+
+def main():
+    parser = argparse.ArgumentParser(description='parse_vals benchmark')
+    parser.add_argument('--inputs', default='500,5000,50000',
+        help='comma-separated list of input counts to generate')
+    parser.add_argument('--depth', type=int, default=6,
+        help='the maximum group nesting depth')
+    parser.add_argument('--rounds', type=int, default=5,
+        help='the number of rounds to run (the best is reported)')
+    args = parser.parse_args()
+
+    editor = EditorAPI(None)
+    for inputs in [int(i) for i in args.inputs.split(',')]:
+        doc = generate(inputs, args.depth)
+        new, new_resp = timed(editor.parse_vals, doc, args.rounds)
+        old, old_resp = timed(legacy_parse_vals, doc, args.rounds)
+        assert new_resp == old_resp, 'parse_vals output differs'
+        print('{:>8} inputs {:>8} settings  legacy {:>8.4f}s  '
+              'current {:>8.4f}s  {:>6.1f}x'.format(inputs, len(new_resp),
+              old, new, old / new if new else 0))
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,144 @@
+'''
+NessusReportv2 parser benchmark
+
+Generates (or reuses) deterministic synthetic .nessus files at several scales
+and measures the parser in each of its parse modes.  Every measurement is run
+within its own python process so that the peak RSS reported belongs to that
+measurement alone.  The results are written as JSON so that they can be
+compared across commits.
+
+Usage:
+    python benchmarks/bench_nessusv2.py [--scales 1000,10000,100000]
+        [--corpus DIR] [--output FILE] [--compare FILE]
+
+Measurements:
+    records         The number of ReportItems returned.
+    seconds         The total time taken to parse the file.
+    records_sec     The parse rate in records per second.
+    first_record    The time (in seconds) until the first record was returned.
+    peak_rss_mb     The peak resident set size of the parsing process.
+'''
+import argparse, json, os, platform, resource, subprocess, sys, tempfile, time
+
+HERE = os.path.abspath(os.path.dirname(__file__))
+sys.path.insert(0, os.path.join(HERE, '..'))
+import corpus
+
+MODES = {
+    'default': {},
+    'plugin_table': {'plugin_table': True},
+}
+'''
+dict: The parse modes to measure, along with the NessusReportv2 arguments
+used for each of them.
+'''
+
+
+def measure(path, mode):
+    '''
+    Parses the file using the requested mode and returns the measurements.
+    This is run within the child process.
+    '''
+    from tenable.reports import NessusReportv2
+    start = time.time()
+    first = None
+    count = 0
+    for item in NessusReportv2(path, **MODES[mode]):
+        if first is None:
+            first = time.time() - start
+        count += 1
+    elapsed = time.time() - start
+
+    # ru_maxrss is reported in kilobytes on Linux and in bytes on macOS.
+    rss = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    if sys.platform != 'darwin':
+        rss *= 1024
+    return {
+        'records': count,
+        'seconds': round(elapsed, 4),
+        'records_sec': round(count / elapsed, 1) if elapsed else None,
+        'first_record': round(first, 6) if first is not None else None,
+        'peak_rss_mb': round(rss / 1048576.0, 1),
+    }
+
+
+def commit():
+    '''
+    Returns the git commit of the working tree (if we can determine it).
+    '''
+    try:
+        return subprocess.check_output(['git', 'rev-parse', 'HEAD'],
+            cwd=HERE).decode().strip()
+    except Exception:
+        return None
+
+
+def run(scales, corpus_dir):
+    results = list()
+    for hosts in scales:
+        path = os.path.join(corpus_dir, 'corpus-{}.nessus'.format(hosts))
+        if not os.path.exists(path):
+            print('generating {}...'.format(path))
+            corpus.generate(path, hosts)
+        for mode in sorted(MODES):
+            out = subprocess.check_output([sys.executable, __file__,
+                '--child', path, mode])
+            result = json.loads(out.decode())
+            result.update({'hosts': hosts, 'mode': mode,
+                'file_mb': round(os.path.getsize(path) / 1048576.0, 1)})
+            results.append(result)
+            print('{hosts:>8} hosts {mode:<14} {records:>9} records '
+                  '{records_sec:>10} rec/s  first {first_record}s  '
+                  'rss {peak_rss_mb}MB'.format(**result))
+    return results
+
+
+def compare(old, new):
+    '''
+    Prints the change in parse rate and peak RSS between two result sets.
+    '''
+    prev = dict([((r['hosts'], r['mode']), r) for r in old['results']])
+    for r in new['results']:
+        o = prev.get((r['hosts'], r['mode']))
+        if o and o['records_sec'] and r['records_sec']:
+            print('{:>8} hosts {:<14} rate {:+.1f}%  rss {:+.1f}MB'.format(
+                r['hosts'], r['mode'],
+                (r['records_sec'] / o['records_sec'] - 1) * 100,
+                r['peak_rss_mb'] - o['peak_rss_mb']))
+
+
+def main():
+    parser = argparse.ArgumentParser(description='NessusReportv2 benchmark')
+    parser.add_argument('--scales', default='1000,10000,100000',
+        help='comma-separated list of host counts to generate')
+    parser.add_argument('--corpus',
+        default=os.path.join(tempfile.gettempdir(), 'pytenable-corpus'),
+        help='directory to store the generated corpus files in')
+    parser.add_argument('--output', default='bench_nessusv2.json',
+        help='file to write the JSON results to')
+    parser.add_argument('--compare', help='previous JSON results to compare')
+    parser.add_argument('--child', nargs=2, help=argparse.SUPPRESS)
+    args = parser.parse_args()
+
+    if args.child:
+        print(json.dumps(measure(*args.child)))
+        return
+
+    if not os.path.exists(args.corpus):
+        os.makedirs(args.corpus)
+    output = {
+        'commit': commit(),
+        'python': platform.python_version(),
+        'platform': platform.platform(),
+        'timestamp': int(time.time()),
+        'results': run([int(i) for i in args.scales.split(',')], args.corpus),
+    }
+    with open(args.output, 'w') as fobj:
+        json.dump(output, fobj, indent=2)
+    if args.compare:
+        with open(args.compare) as fobj:
+            compare(json.load(fobj), output)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,130 @@
+'''
+Synthetic .nessus corpus generator
+
+Generates deterministic Nessus v2 report files for benchmarking and load
+testing.  The same arguments (including the seed) will always produce the same
+file, so results can be compared across commits.
+
+Usage:
+    python benchmarks/corpus.py OUTPUT HOSTS [FINDINGS_PER_HOST] [PROPERTIES]
+
+Example:
+    python benchmarks/corpus.py corpus-10k.nessus 10000 5-40 5-30
+'''
+import os, random, sys
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+from tenable.reports import NessusReportv2Writer
+
+SEVERITIES = ['None', 'Low', 'Medium', 'High', 'Critical']
+FAMILIES = [
+    'General', 'Windows', 'Web Servers', 'Databases', 'Service detection',
+    'Misc.', 'Ubuntu Local Security Checks', 'Windows : Microsoft Bulletins',
+]
+WORDS = (
+    'remote host affected vulnerability version service allows attacker '
+    'execute arbitrary code denial update configuration package server '
+    'client authentication bypass information disclosure overflow request'
+).split()
+
+
+def _text(rng, words):
+    return ' '.join([rng.choice(WORDS) for i in range(words)])
+
+
+def _plugins(rng, count):
+    '''
+    Builds the pool of synthetic plugins that findings are drawn from.
+    '''
+    plugins = list()
+    for i in range(count):
+        sev = rng.randint(0, 4)
+        plugin = {
+            'pluginID': str(10000 + i),
+            'pluginName': _text(rng, 5).title(),
+            'pluginFamily': rng.choice(FAMILIES),
+            'severity': str(sev),
+            'risk_factor': SEVERITIES[sev],
+            'description': _text(rng, rng.randint(20, 200)),
+            'solution': _text(rng, rng.randint(5, 40)),
+            'synopsis': _text(rng, rng.randint(5, 20)),
+            'plugin_type': rng.choice(['local', 'remote', 'combined']),
+            'script_version': '1.{}'.format(rng.randint(1, 99)),
+        }
+        if sev > 0:
+            plugin['cvss_base_score'] = '{:.1f}'.format(rng.uniform(1, 10))
+            plugin['cve'] = ['CVE-20{:02d}-{:04d}'.format(
+                rng.randint(0, 18), rng.randint(1, 9999))
+                for c in range(rng.randint(1, 6))]
+            plugin['see_also'] = 'https://example.com/{}'.format(i)
+        plugins.append(plugin)
+    return plugins
+
+
+def _range(value):
+    '''
+    Converts a "LOW-HIGH" (or single number) string into a (low, high) tuple.
+    '''
+    if isinstance(value, tuple):
+        return value
+    parts = [int(i) for i in str(value).split('-')]
+    return (parts[0], parts[-1])
+
+
+def generate(path, hosts, findings=(5, 40), properties=(5, 30),
+             plugins=2000, seed=0):
+    '''
+    Generates a synthetic Nessus v2 report.
+
+    Args:
+        path (str): The path of the file to write.
+        hosts (int): The number of hosts to generate.
+        findings (tuple, optional):
+            The (low, high) range of findings to generate per host.
+        properties (tuple, optional):
+            The (low, high) range of host properties to generate per host.
+        plugins (int, optional):
+            The number of distinct plugins to draw the findings from.
+        seed (int, optional):
+            The random seed to use.
+
+    Returns:
+        int: The number of findings written.
+    '''
+    rng = random.Random(seed)
+    findings = _range(findings)
+    properties = _range(properties)
+    pool = _plugins(rng, plugins)
+    count = 0
+    with NessusReportv2Writer(path, name='pyTenable synthetic corpus',
+            policy_name='Basic Network Scan') as writer:
+        for h in range(hosts):
+            ip = '10.{}.{}.{}'.format((h >> 16) & 255, (h >> 8) & 255, h & 255)
+            host = {
+                'host-report-name': ip,
+                'host-ip': ip,
+                'HOST_START': 'Thu Jan  4 10:00:00 2018',
+                'HOST_END': 'Thu Jan  4 10:{:02d}:00 2018'.format(h % 60),
+                'operating-system': rng.choice(
+                    ['Linux Kernel 4.4', 'Microsoft Windows Server 2012']),
+            }
+            for p in range(rng.randint(*properties)):
+                host['traceroute-hop-{}'.format(p)] = '10.0.{}.{}'.format(
+                    p, rng.randint(1, 254))
+            for f in range(rng.randint(*findings)):
+                item = dict(host)
+                item.update(rng.choice(pool))
+                item['port'] = str(rng.choice([0, 22, 80, 443, 445, 3389]))
+                item['protocol'] = 'tcp'
+                item['svc_name'] = 'general'
+                item['plugin_output'] = _text(rng, rng.randint(0, 60))
+                writer.write(item)
+                count += 1
+    return count
+
+
+if __name__ == '__main__':
+    if len(sys.argv) < 3:
+        print(__doc__)
+        sys.exit(1)
+    print(generate(sys.argv[1], int(sys.argv[2]), *sys.argv[3:5]))
@@ -203,7 +203,8 @@ class APIEndpoint(object):
         # TypeError as it was something we weren't expecting.
         if not type_pass:
             raise TypeError('{} is of type {}.  Expected {}.'.format(
-                name, obj.__class__.__name__, expected_type.__name__
+                name, obj.__class__.__name__, ' or '.join(
+                    [getattr(t, '__name__', str(t)) for t in etypes])
             ))
 
         # if the object is only expected to have one of a finite set of values,
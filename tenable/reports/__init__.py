@@ -0,0 +1,3 @@
+from .nessusv2 import NessusReportv2, NessusReportv2Writer
+from .converters import to_csv, to_jsonl, to_sqlite
+from .diff import NessusReportDiff
@@ -0,0 +1,210 @@
+import csv, io, json, sqlite3
+from .nessusv2 import NessusReportv2
+
+CSV_FIELDS = [
+    'host-report-name', 'host-ip', 'host-fqdn', 'netbios-name', 'pluginID',
+    'pluginName', 'pluginFamily', 'severity', 'risk_factor', 'port',
+    'protocol', 'svc_name', 'cvss_base_score', 'cve', 'synopsis',
+    'description', 'solution', 'see_also', 'plugin_output',
+]
+'''
+list: The default columns written by :func:`to_csv`.
+'''
+
+BUFFER_SIZE = 1048576
+'''
+int: The write buffer size (in bytes) used for the text sinks when we open the
+destination file ourselves.
+'''
+
+
+def _records(report):
+    '''
+    Returns an iterable of records from the report.  If we were handed a path
+    or a file object instead of something we can iterate over, then we will
+    wrap it in a NessusReportv2 parser.
+    '''
+    if isinstance(report, str) or hasattr(report, 'read'):
+        return NessusReportv2(report)
+    return report
+
+
+def _open(dest, mode, **kw):
+    '''
+    Returns a tuple of the file object to write to and whether or not we opened
+    the file ourselves (and therefore need to close it).
+    '''
+    if hasattr(dest, 'write'):
+        return dest, False
+    return io.open(dest, mode, buffering=BUFFER_SIZE, **kw), True
+
+
+def to_jsonl(report, dest):
+    '''
+    Streams the records from a Nessus report into a JSON Lines file, one JSON
+    document per ReportItem.
+
+    Args:
+        report (NessusReportv2 or iterable):
+            The parser (or any iterable of record dictionaries) to read from.
+            A path or file object pointing to a .nessus file may also be passed
+            and will be parsed using :class:`~tenable.reports.NessusReportv2`.
+        dest (str or FileObject):
+            The path or the text-mode file object to write the records to.
+
+    Returns:
+        int: The number of records written.
+
+    Examples:
+        >>> to_jsonl('example.nessus', 'example.jsonl')
+    '''
+    fobj, opened = _open(dest, 'w', encoding='utf-8')
+    count = 0
+    try:
+        for item in _records(report):
+            fobj.write(u'{}\n'.format(json.dumps(item)))
+            count += 1
+    finally:
+        if opened:
+            fobj.close()
+    return count
+
+
+def to_csv(report, dest, fields=None, list_sep='\n'):
+    '''
+    Streams the records from a Nessus report into a CSV file.  As we never
+    look at the whole report before writing, the columns must be known up
+    front.  Any attributes of the records that are not one of the columns will
+    be ignored.
+
+    Args:
+        report (NessusReportv2 or iterable):
+            The parser (or any iterable of record dictionaries) to read from.
+            A path or file object pointing to a .nessus file may also be passed
+            and will be parsed using :class:`~tenable.reports.NessusReportv2`.
+        dest (str or FileObject):
+            The path or the text-mode file object to write the records to.
+        fields (list, optional):
+            The list of columns to write.  If left unspecified, then the
+            columns in ``CSV_FIELDS`` will be used.
+        list_sep (str, optional):
+            The separator used to collapse multi-valued attributes (such as
+            CVEs) into a single cell.  The default is a newline.
+
+    Returns:
+        int: The number of records written.
+
+    Examples:
+        >>> to_csv('example.nessus', 'example.csv')
+    '''
+    if not fields:
+        fields = CSV_FIELDS
+    fobj, opened = _open(dest, 'w', encoding='utf-8', newline='')
+    count = 0
+    try:
+        writer = csv.DictWriter(fobj, fields, extrasaction='ignore')
+        writer.writeheader()
+        for item in _records(report):
+            row = dict()
+            for key in fields:
+                value = item.get(key)
+                if isinstance(value, list):
+                    value = list_sep.join(value)
+                row[key] = value
+            writer.writerow(row)
+            count += 1
+    finally:
+        if opened:
+            fobj.close()
+    return count
+
+
+def to_sqlite(report, dest, table='findings', batch_size=1000, fields=None):
+    '''
+    Streams the records from a Nessus report into a SQLite table.  The records
+    are inserted in batches, with each batch written within a single
+    transaction.  The table will be created if it doesn't already exist, with
+    a column for each of the finding fields and an ``attributes`` column that
+    stores every other attribute of the record (such as the host properties,
+    which vary from host to host) as a JSON document.  Multi-valued attributes
+    (such as CVEs) within the field columns are stored as JSON lists.
+
+    Args:
+        report (NessusReportv2 or iterable):
+            The parser (or any iterable of record dictionaries) to read from.
+            A path or file object pointing to a .nessus file may also be passed
+            and will be parsed using :class:`~tenable.reports.NessusReportv2`.
+        dest (str or sqlite3.Connection):
+            The path to the SQLite database or an open connection to use.
+        table (str, optional):
+            The name of the table to write the records into.  The default is
+            ``findings``.
+        batch_size (int, optional):
+            The number of records to insert per transaction.  The default is
+            ``1000``.
+        fields (list, optional):
+            The list of attributes to store within their own columns.  If left
+            unspecified, then the columns in ``CSV_FIELDS`` will be used.
+
+    Returns:
+        int: The number of records written.
+
+    Examples:
+        >>> to_sqlite('example.nessus', 'example.db')
+
+        Querying the host properties stored within the attributes column:
+
+        >>> conn = sqlite3.connect('example.db')
+        >>> conn.execute("SELECT pluginID, json_extract(attributes, "
+        ...     "'$.hostname') FROM findings").fetchall()
+    '''
+    if not fields:
+        fields = CSV_FIELDS
+    if isinstance(dest, sqlite3.Connection):
+        conn, opened = dest, False
+    else:
+        conn, opened = sqlite3.connect(dest), True
+
+    def quote(name):
+        # SQLite identifiers are wrapped in double-quotes with any embedded
+        # double-quotes escaped by doubling them.
+        return '"{}"'.format(name.replace('"', '""'))
+
+    # As the attribute names within a report are unbounded (numbered host
+    # properties, patch summaries, etc.), only the finding fields are given
+    # their own columns.  Everything else is stored within the attributes
+    # column so that we never run into SQLite's column limit.
+    columns = list(fields) + ['attributes']
+    fieldset = set(fields)
+    conn.execute('CREATE TABLE IF NOT EXISTS {} ({})'.format(quote(table),
+        ', '.join([quote(c) for c in columns])))
+    insert = 'INSERT INTO {} ({}) VALUES ({})'.format(quote(table),
+        ', '.join([quote(c) for c in columns]),
+        ', '.join(['?' for c in columns]))
+
+    def row(item):
+        values = [json.dumps(item[c]) if isinstance(item.get(c), list)
+            else item.get(c) for c in fields]
+        values.append(json.dumps(dict([(k, v) for k, v in item.items()
+            if k not in fieldset])))
+        return values
+
+    def flush(batch):
+        with conn:
+            conn.executemany(insert, [row(i) for i in batch])
+
+    count = 0
+    batch = list()
+    try:
+        for item in _records(report):
+            batch.append(item)
+            count += 1
+            if len(batch) >= batch_size:
+                flush(batch)
+                batch = list()
+        if batch:
+            flush(batch)
+    finally:
+        if opened:
+            conn.close()
+    return count
@@ -0,0 +1,170 @@
+import json, os, shutil, sqlite3, tempfile
+from .nessusv2 import NessusReportv2
+
+DIFF_KEY = ['host-report-name', 'pluginID', 'port', 'protocol']
+'''
+list: The attributes that uniquely identify a finding between two reports.
+'''
+
+DIFF_FIELDS = ['severity', 'svc_name', 'plugin_output']
+'''
+list: The attributes compared to determine if a finding has changed.
+'''
+
+
+class NessusReportDiff(object):
+    '''
+    The NessusReportDiff generator will compare two Nessus version 2 formatted
+    reports and return the findings that have been added, removed, or changed
+    between them.  Findings are matched using the host, pluginID, port, and
+    protocol.
+
+    The older report is read first and is held in memory until the number of
+    findings exceeds the memory limit, at which point the findings are spilled
+    into a temporary on-disk SQLite table.  The newer report is then streamed
+    and compared against the stored findings one at a time, so only the older
+    report ever needs to be stored.
+
+    Each returned record is a dictionary with the following attributes:
+
+    * ``action``: Either ``added``, ``removed``, or ``changed``.
+    * ``key``: The (host, pluginID, port, protocol) tuple for the finding.
+    * ``old``: The finding from the older report (None if added).
+    * ``new``: The finding from the newer report (None if removed).
+
+    Args:
+        old (File object or string path):
+            The older of the two .nessus files to compare.
+        new (File object or string path):
+            The newer of the two .nessus files to compare.
+        fields (list, optional):
+            The list of attributes to compare in order to determine if a
+            finding has changed.  The default is ``DIFF_FIELDS``.
+        memory_limit (int, optional):
+            The maximum number of findings from the older report to keep in
+            memory before spilling to disk.  The default is ``100000``.
+        tmpdir (str, optional):
+            The directory to store the spill database within.  If left
+            unspecified the system temporary directory will be used.
+
+    Examples:
+        >>> for item in NessusReportDiff('january.nessus', 'february.nessus'):
+        ...     print(item['action'], item['key'])
+    '''
+    def __init__(self, old, new, fields=None, memory_limit=100000,
+                 tmpdir=None):
+        self._old = NessusReportv2(old, plugin_table=True)
+        self._new = NessusReportv2(new, plugin_table=True)
+        self._fields = fields if fields else DIFF_FIELDS
+        self._memory_limit = memory_limit
+        self._tmpdir = tmpdir
+        self._mem = dict()
+        self._db = None
+        self._dbdir = None
+
+    def __iter__(self):
+        return self._diff()
+
+    def _key(self, item):
+        return tuple([item.get(k) for k in DIFF_KEY])
+
+    def _spill(self):
+        '''
+        Moves the in-memory findings into the on-disk spill database.
+        '''
+        if not self._db:
+            self._dbdir = tempfile.mkdtemp(dir=self._tmpdir)
+            self._db = sqlite3.connect(os.path.join(self._dbdir, 'diff.db'))
+            self._db.execute(
+                'CREATE TABLE findings (key TEXT PRIMARY KEY, item TEXT)')
+        with self._db:
+            self._db.executemany(
+                'INSERT OR REPLACE INTO findings VALUES (?, ?)',
+                [(json.dumps(k), json.dumps(v)) for k, v in self._mem.items()])
+        self._mem = dict()
+
+    def _store(self, key, item):
+        '''
+        Stores the finding, replacing any finding already stored for the key
+        (whether in memory or spilled to disk) so that the results never
+        depend upon the memory limit.
+        '''
+        if self._db and key not in self._mem:
+            self._db.execute('DELETE FROM findings WHERE key = ?',
+                (json.dumps(key),))
+        self._mem[key] = item
+        if len(self._mem) >= self._memory_limit:
+            self._spill()
+
+    def _pop(self, key):
+        '''
+        Removes and returns the stored finding for the key (if any).
+        '''
+        if key in self._mem:
+            return self._mem.pop(key)
+        if self._db:
+            dkey = json.dumps(key)
+            row = self._db.execute(
+                'SELECT item FROM findings WHERE key = ?', (dkey,)).fetchone()
+            if row:
+                self._db.execute('DELETE FROM findings WHERE key = ?', (dkey,))
+                return json.loads(row[0])
+
+    def _remaining(self):
+        '''
+        Returns all of the stored findings that were never matched.
+        '''
+        for key, item in self._mem.items():
+            yield key, item
+        if self._db:
+            for row in self._db.execute('SELECT key, item FROM findings'):
+                yield tuple(json.loads(row[0])), json.loads(row[1])
+
+    def _graft(self, item, report):
+        '''
+        Grafts the static plugin information back onto the finding.
+        '''
+        if item is not None:
+            return report.graft(item)
+
+    def _record(self, action, key, old, new):
+        return {
+            'action': action,
+            'key': key,
+            'old': self._graft(old, self._old),
+            'new': self._graft(new, self._new),
+        }
+
+    def _diff(self):
+        try:
+            # Load the older report into the store, spilling to disk whenever
+            # we run past the memory limit.
+            for item in self._old:
+                self._store(self._key(item), item)
+
+            # Stream the newer report and match each finding against the
+            # store.  Anything that we match is removed from the store so that
+            # whatever is left over at the end were the removed findings.
+            for item in self._new:
+                key = self._key(item)
+                old = self._pop(key)
+                if old is None:
+                    yield self._record('added', key, None, item)
+                    continue
+
+                # The plugin information is grafted back on before comparing
+                # so that changes to plugin fields (such as the CVSS score)
+                # are seen as well.
+                old = self._old.graft(old)
+                new = self._new.graft(item)
+                if [old.get(f) for f in self._fields] != [
+                      new.get(f) for f in self._fields]:
+                    yield self._record('changed', key, old, new)
+
+            for key, item in self._remaining():
+                yield self._record('removed', key, item, None)
+        finally:
+            if self._db:
+                self._db.close()
+                shutil.rmtree(self._dbdir)
+                self._db = None
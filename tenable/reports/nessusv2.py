@@ -1,6 +1,71 @@
 from lxml import etree
 import dateutil.parser, time
 
+PLUGIN_ATTRIBUTES = set([
+    'pluginName', 'pluginFamily',
+])
+'''
+set: The ReportItem attributes that are static for any given plugin.
+'''
+
+PLUGIN_FIELDS = set([
+    'agent', 'always_run', 'bid', 'canvas_package', 'cert', 'cisco-sa', 'cpe',
+    'cve', 'cvss3_base_score', 'cvss3_temporal_score',
+    'cvss3_temporal_vector', 'cvss3_vector', 'cvss_base_score',
+    'cvss_temporal_score', 'cvss_temporal_vector', 'cvss_vector', 'cwe',
+    'd2_elliot_name', 'description', 'edb-id', 'exploit_available',
+    'exploit_framework_canvas', 'exploit_framework_core',
+    'exploit_framework_d2_elliot', 'exploit_framework_metasploit',
+    'exploitability_ease', 'exploited_by_malware', 'exploited_by_nessus',
+    'fname', 'iava', 'iavb', 'iavt', 'in_the_news', 'metasploit_name', 'msft',
+    'mskb', 'osvdb', 'patch_publication_date', 'plugin_modification_date',
+    'plugin_name', 'plugin_publication_date', 'plugin_type', 'rhsa',
+    'risk_factor', 'script_version', 'see_also', 'solution', 'stig_severity',
+    'synopsis', 'unsupported_by_vendor', 'usn', 'vuln_publication_date',
+    'xref',
+])
+'''
+set: The ReportItem child elements that are static for any given plugin.
+Anything not listed here (such as ``plugin_output`` or the compliance check
+results) is considered to be specific to the finding itself.
+'''
+
+REPORT_ITEM_ATTRIBUTES = [
+    'port', 'svc_name', 'protocol', 'severity', 'pluginID', 'pluginName',
+    'pluginFamily',
+]
+'''
+list: The attributes that are stored on the ReportItem element itself.
+'''
+
+HOST_PROPERTIES = set([
+    'Credentialed_Scan', 'HOST_END', 'HOST_END_TIMESTAMP', 'HOST_START',
+    'HOST_START_TIMESTAMP', 'LastAuthenticatedResults',
+    'LastUnauthenticatedResults', 'bios-uuid', 'host-fqdn', 'host-ip',
+    'host-rdns', 'hostname', 'local-checks-proto', 'mac-address',
+    'netbios-name', 'operating-system', 'operating-system-unsupported', 'os',
+    'policy-used', 'sinfp-signature', 'smb-login-used', 'ssh-auth-meth',
+    'ssh-login-used', 'system-type',
+])
+'''
+set: The commonly seen host property names.  This is used by the report writer
+to tell host properties apart from ReportItem attributes when it isn't told
+what the host properties are.
+'''
+
+HOST_PROPERTY_PREFIXES = (
+    'cpe-', 'enumerated-ports-', 'netstat-', 'patch-summary-', 'pcidss:',
+    'ssh-fingerprint', 'traceroute-hop-',
+)
+'''
+tuple: The name prefixes for the numbered/grouped host properties.
+'''
+
+CM_NAMESPACE = 'http://www.nessus.org/cm'
+'''
+str: The XML namespace used for the compliance ReportItem attributes.
+'''
+
 
 class NessusReportv2(object):
     '''
@@ -10,13 +75,44 @@ class NessusReportv2(object):
     host properties attached.  The ReportItem's structure itself will determine
     the resulting dictionary, what attributes are returned, and what is not.
 
+    As the plugin text (description, solution, synopsis, CVEs, etc.) is
+    generally the same for every instance of a plugin, it is stored once in
+    the ``plugins`` table keyed by the pluginID.  Every returned ReportItem
+    whose plugin text matches the table shares the values within the table
+    instead of storing its own copy, so the returned values should be treated
+    as read-only.  ReportItems whose plugin text differs from the table (such
+    as compliance checks, which carry the check text within the description)
+    always keep their own values.
+
     Args:
         fobj (File object or string path):
             Either a File-like object or a string path pointing to the file to
             be parsed.
+        plugin_table (bool, optional):
+            If set to ``True``, then the static plugin information will not be
+            grafted onto the returned ReportItems, leaving only the per-finding
+            information (pluginID, port, protocol, plugin_output, etc.) and the
+            host properties.  The plugin information can then be looked up in
+            the ``plugins`` attribute using the pluginID (or grafted back on
+            using :func:`graft`).  ReportItems that differ from the table
+            still carry their own plugin information.  The default is
+            ``False``.
+
+    Attributes:
+        host_properties (set):
+            The names of the host properties that have been seen so far.  This
+            is useful for telling the host properties apart from the ReportItem
+            attributes within the returned dictionaries.
+        plugins (dict):
+            The table of static plugin information that has been seen so far,
+            keyed by the pluginID.
     '''
-    def __init__(self, fobj):
+    def __init__(self, fobj, plugin_table=False):
         self._iter = etree.iterparse(fobj, events=('start', 'end'))
+        self._plugin_table = plugin_table
+        self._overlap = False
+        self.host_properties = set()
+        self.plugins = dict()
 
     def __iter__(self):
         return self
@@ -40,6 +136,46 @@ class NessusReportv2(object):
             # format that we should convert into a unix timestamp.
             return time.mktime(dateutil.parser.parse(value).timetuple())
 
+    def _graft(self, vuln, plugin, overlap_only=False):
+        '''
+        Grafts the plugin information onto the vuln.  Any attribute that the
+        vuln already has (such as a host property sharing its name with a
+        plugin field) is turned into a list of both values, just as it would
+        have been had the ReportItem been parsed as a whole.  If overlap_only
+        is set, then only those overlapping attributes are grafted.
+        '''
+        if not self._overlap:
+            # None of the host properties share a name with a plugin field,
+            # so there can't be any overlapping attributes.
+            if not overlap_only:
+                vuln.update(plugin)
+            return
+        for key, value in plugin.items():
+            if key in vuln:
+                current = vuln[key] if isinstance(vuln[key], list) else [
+                    vuln[key],]
+                vuln[key] = current + (value if isinstance(value, list)
+                    else [value,])
+            elif not overlap_only:
+                vuln[key] = value
+
+    def graft(self, item):
+        '''
+        Returns a copy of a ReportItem that was parsed using
+        ``plugin_table=True`` with the static plugin information from the
+        ``plugins`` table grafted back on.  Any attributes that the item
+        already has take precedence over the table.
+
+        Args:
+            item (dict): The ReportItem dictionary.
+
+        Returns:
+            dict: The ReportItem with the plugin information.
+        '''
+        vuln = dict(self.plugins.get(item.get('pluginID'), {}))
+        vuln.update(item)
+        return vuln
+
     def next(self):
         '''
         Get the next ReportItem from the nessus file and return it as a
@@ -54,12 +190,15 @@ class NessusReportv2(object):
                 # the host information cache, starting with the ReportHost's
                 # name for the host.
                 self._cache = {'host-report-name': elem.get('name')}
+                self._overlap = False
 
             if event == 'end' and elem.tag == 'HostProperties':
                 # Once we have finished parsing out all of the host properties,
                 # we need to update the host cache with this new information.
                 for child in elem.getchildren():
                     self._cache[child.get('name')] = child.text
+                    self.host_properties.add(child.get('name'))
+                self._overlap = not PLUGIN_FIELDS.isdisjoint(self._cache)
                 elem.clear()
 
             if event == 'end' and elem.tag == 'ReportHost':
@@ -79,20 +218,227 @@ class NessusReportv2(object):
                 # return the data as a python dictionary.
                 vuln = dict(elem.attrib)
                 vuln.update(self._cache)
+
+                # The static plugin information is parsed out separately from
+                # the per-finding information so that it can be compared
+                # against the plugin table.
+                static = dict()
+                for key in PLUGIN_ATTRIBUTES:
+                    if key in vuln:
+                        static[key] = vuln.pop(key)
                 for c in elem.getchildren():
-                    # iterate through each child element and add it to the vuln
-                    # dictionary.  We will also check to see if we have seen
-                    # the tag before, and if so, convert the stored value to a 
-                    # list of values.  The need to return a list is common for
-                    # things like CVEs, BIDs, See-Alsos, etc.
-                    if c.tag in vuln:
-                        if not isinstance(vuln[c.tag], list):
-                            vuln[c.tag] = [vuln[c.tag],]
-                        vuln[c.tag].append(self._defs(c.tag, c.text))
+                    # iterate through each child element and add it to either
+                    # the static or the vuln dictionary.  We will also check to
+                    # see if we have seen the tag before, and if so, convert
+                    # the stored value to a list of values.  The need to
+                    # return a list is common for things like CVEs, BIDs,
+                    # See-Alsos, etc.
+                    item = static if c.tag in PLUGIN_FIELDS else vuln
+                    if c.tag in item:
+                        if not isinstance(item[c.tag], list):
+                            item[c.tag] = [item[c.tag],]
+                        item[c.tag].append(self._defs(c.tag, c.text))
                     else:
-                        vuln[c.tag] = self._defs(c.tag, c.text)
+                        item[c.tag] = self._defs(c.tag, c.text)
+
+                # If this is the first time that we have seen this plugin, then
+                # the static information becomes the plugin table entry.
+                # Compliance checks carry their own check text within the
+                # description (and similar fields), so they are never used to
+                # seed the table.
+                plugin_id = vuln.get('pluginID')
+                plugin = self.plugins.get(plugin_id)
+                if plugin is None and vuln.get('compliance') != 'true':
+                    plugin = self.plugins[plugin_id] = static
+
+                if plugin is not None and plugin == static:
+                    # The finding matches the table entry, so we will share
+                    # the table's values instead of keeping our own copy.
+                    # Unless we were asked to only return the per-finding
+                    # data, the shared values are grafted back onto the vuln.
+                    self._graft(vuln, plugin, overlap_only=self._plugin_table)
+                else:
+                    # Anything that differs from the table entry (such as a
+                    # compliance check) keeps its own values.
+                    self._graft(vuln, static)
 
                 # Clear out the element from the element tree and return the
                 # vuln dictionary.
                 elem.clear()
                 return vuln
+
+
+
+class _DefaultHostProperties(object):
+    '''
+    Container used by the report writer to determine if an attribute is a host
+    property when no explicit listing was given.
+    '''
+    def __contains__(self, name):
+        return (name in HOST_PROPERTIES
+            or str(name).startswith(HOST_PROPERTY_PREFIXES))
+
+
+class NessusReportv2Writer(object):
+    '''
+    The NessusReportv2Writer will write a Nessus version 2 formatted report
+    file from the python dictionaries that are returned from
+    :class:`NessusReportv2`.  The file is written incrementally as each item is
+    handed to the writer, so the report is never held within memory.
+
+    ReportItems are grouped into ReportHosts using the ``host-report-name``
+    attribute.  As the items are written in the order that they are received,
+    all of the items for a given host should be written together.
+
+    Args:
+        fobj (File object or string path):
+            Either a File-like object or a string path pointing to the file to
+            be written.
+        name (str, optional):
+            The name of the report.  The default is ``pyTenable Report``.
+        policy_name (str, optional):
+            If specified, a minimal Policy section will be written with the
+            policy name set to this value.
+        host_properties (set, optional):
+            The names of the attributes that should be written as host
+            properties.  Passing the ``host_properties`` attribute from the
+            :class:`NessusReportv2` parser that is reading the source report
+            will ensure that the host properties are preserved exactly.  If
+            left unspecified, the commonly seen host property names will be
+            used instead.
+        plugins (dict, optional):
+            If the ReportItems were parsed using ``plugin_table=True``, then
+            passing the ``plugins`` attribute from the parser will graft the
+            static plugin information back onto each ReportItem as it is
+            written.
+
+    Examples:
+        Writing out only the critical findings from a report:
+
+        >>> report = NessusReportv2('example.nessus')
+        >>> with NessusReportv2Writer('critical.nessus',
+        ...         host_properties=report.host_properties) as writer:
+        ...     for item in report:
+        ...         if item['severity'] == '4':
+        ...             writer.write(item)
+    '''
+    def __init__(self, fobj, name='pyTenable Report', policy_name=None,
+                 host_properties=None, plugins=None):
+        self._host_properties = (host_properties if host_properties is not None
+            else _DefaultHostProperties())
+        self._plugins = plugins
+        self._host = None
+        self._stack = list()
+
+        # Open up the file and write out the document declaration and the
+        # opening elements for the report.
+        self._open(etree.xmlfile(fobj, encoding='utf-8'))
+        self._xf = self._stack[-1][1]
+        self._xf.write_declaration()
+        self._open(self._xf.element('NessusClientData_v2'))
+        if policy_name:
+            policy = etree.Element('Policy')
+            etree.SubElement(policy, 'policyName').text = policy_name
+            self._xf.write(policy)
+        self._open(self._xf.element('Report', name=name,
+            nsmap={'cm': CM_NAMESPACE}))
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        self.close()
+
+    def _open(self, ctx):
+        '''
+        Enters the context of an element (or the file itself), keeping track of
+        it so that it can be closed out later on.
+        '''
+        self._stack.append((ctx, ctx.__enter__()))
+
+    def _close(self):
+        '''
+        Closes the most recently opened element.
+        '''
+        ctx, obj = self._stack.pop()
+        ctx.__exit__(None, None, None)
+
+    def _value(self, parent, tag, value):
+        '''
+        Adds the value as a child element of the parent, writing one element
+        per value for multi-valued attributes.
+        '''
+        for val in value if isinstance(value, list) else [value,]:
+            etree.SubElement(parent, tag).text = val
+
+    def _host_value(self, value):
+        '''
+        Returns the host-level value of a host property.  When a host property
+        shares its name with a ReportItem child, the parser returns a list of
+        the host's value followed by the ReportItem's own values.
+        '''
+        if isinstance(value, list):
+            return value[0] if value else None
+        return value
+
+    def write(self, item):
+        '''
+        Writes the ReportItem dictionary into the report.
+
+        Args:
+            item (dict): The ReportItem dictionary to write.
+
+        Returns:
+            None
+        '''
+        host = item.get('host-report-name')
+        if host != self._host or len(self._stack) < 4:
+            # As we have hit a new host, we need to close out the current
+            # ReportHost (if any), open a new one, and write out the host
+            # properties.
+            if len(self._stack) > 3:
+                self._close()
+            self._host = host
+            self._open(self._xf.element('ReportHost', name=host or ''))
+            props = etree.Element('HostProperties')
+            for key in item:
+                if key in self._host_properties:
+                    etree.SubElement(props, 'tag', name=key).text = (
+                        self._host_value(item[key]))
+            self._xf.write(props)
+
+        if self._plugins and item.get('pluginID') in self._plugins:
+            vuln = dict(self._plugins[item['pluginID']])
+            vuln.update(item)
+        else:
+            vuln = item
+
+        # Build out the ReportItem element and write it.  Only the single
+        # ReportItem is ever built in memory.  As the element is built outside
+        # of the document, we need to tell it about the compliance namespace
+        # so that the compliance attributes keep their "cm" prefix.
+        elem = etree.Element('ReportItem', nsmap={'cm': CM_NAMESPACE})
+        for key in REPORT_ITEM_ATTRIBUTES:
+            if key in vuln and vuln[key] is not None:
+                elem.set(key, vuln[key])
+        for key in vuln:
+            if key in REPORT_ITEM_ATTRIBUTES or key == 'host-report-name':
+                continue
+            if key not in self._host_properties:
+                self._value(elem, key, vuln[key])
+            elif isinstance(vuln[key], list):
+                # The host property shares its name with a ReportItem child,
+                # so everything after the host's own value belongs to the
+                # ReportItem.
+                self._value(elem, key, vuln[key][1:])
+        self._xf.write(elem)
+
+    def close(self):
+        '''
+        Closes out all of the open elements and finishes writing the file.
+
+        Returns:
+            None
+        '''
+        while self._stack:
+            self._close()
@@ -1,10 +1,43 @@
 from tenable.base import APISession, APIError, ServerError
-import warnings
+from tenable.utils import threaded_map, MultipartEncoder
+import copy, json, os, tempfile, time, warnings
 
 
 class SecurityCenter(APISession):
+    AGGREGATIONS = {
+        'vuln': {
+            'cve': ('sumcve', 'cveID', 'total'),
+            'dnsName': ('sumdnsname', 'dnsName', 'total'),
+            'family': ('sumfamily', 'family', 'total'),
+            'ip': ('sumip', 'ip', 'total'),
+            'pluginID': ('sumid', 'pluginID', 'total'),
+            'protocol': ('sumprotocol', 'protocol', 'total'),
+            'severity': ('sumseverity', 'severity', 'count'),
+        },
+        'mobile': {
+            'pluginID': ('sumpluginid', 'pluginID', 'total'),
+            'severity': ('sumseverity', 'severity', 'count'),
+        },
+    }
+    '''
+    dict: The summary tools used by :func:`aggregate`.  Each data type maps the
+    group-by field to a tuple of (summary tool, result key field, result count
+    field).
+    '''
+
+    LIST_TOOLS = {
+        'vuln': 'listvuln',
+        'event': 'listdata',
+        'mobile': 'listvuln',
+    }
+    '''
+    dict: The raw listing tool used by :func:`aggregate` for each data type when
+    no summary tool exists for the requested group-by field.
+    '''
+
     def __init__(self, host, port=443, ssl_verify=False, cert=None,
-                 scheme='https', retries=None, backoff=None):
+                 scheme='https', retries=None, backoff=None, cache_file=None,
+                 cache_ttl=86400):
         '''SecurityCenter 5 API Wrapper
         This class is designed to handle authentication management for the
         SecurityCenter 5.x API.  This is by no means a complete model of
@@ -14,6 +47,18 @@ class SecurityCenter(APISession):
 
         For more information, please See Tenable's official API documentation
         at: https://support.tenable.com/support-center/cerberus-support-center/includes/widgets/sc_api/index.html
+
+        Args:
+            cache_file (str, optional):
+                If specified, the system information and the session token &
+                cookies will be stored within this file and reused by later
+                instances.  This allows short-lived scripts to skip the system
+                call and the (slow) password authentication when the cached
+                session is still valid.  As the file contains a session token,
+                it is created readable only by the current user.
+            cache_ttl (int, optional):
+                The number of seconds that the cached system information is
+                considered valid for.  The default is ``86400`` (1 day).
         '''
 
         # As we will always be passing a URL to the APISession class, we will
@@ -38,14 +83,26 @@ class SecurityCenter(APISession):
         if cert:
             self._session.cert = cert
 
-        # We will attempt to make the first call to the SecurityCenter instance
-        # and get the system information.  If this call fails, then we likely
-        # aren't pointing to a SecurityCenter at all and should throw an error
-        # stating this.
-        try:
-            d = self.get('system').json()
-        except:
-            raise ServerError('No SecurityCenter Instance at {}'.format(host))
+        self._cache_file = cache_file
+        self._cache_ttl = cache_ttl
+        self._creds = None
+        self._cached_token = False
+
+        # If we have a fresh copy of the system information cached, then we
+        # can skip the system call entirely.
+        cache = self._read_cache()
+        if ('system' in cache
+          and time.time() - cache['system']['timestamp'] < self._cache_ttl):
+            d = {'response': cache['system']['info']}
+        else:
+            # We will attempt to make the first call to the SecurityCenter
+            # instance and get the system information.  If this call fails,
+            # then we likely aren't pointing to a SecurityCenter at all and
+            # should throw an error stating this.
+            try:
+                d = self.get('system').json()
+            except:
+                raise ServerError('No SecurityCenter Instance at {}'.format(host))
 
         # Now we will try to interpret the SecurityCenter information into
         # something usable.
@@ -57,6 +114,63 @@ class SecurityCenter(APISession):
         except:
             raise ServerError('Invalid SecurityCenter Instance')
 
+        if 'system' not in cache or cache['system']['info'] != d['response']:
+            cache['system'] = {
+                'timestamp': int(time.time()),
+                'info': dict([(k, d['response'][k]) for k in
+                    ['version', 'buildID', 'licenseStatus', 'uuid']]),
+            }
+            self._write_cache(cache)
+
+    def _read_cache(self):
+        '''
+        Reads the cache file (if one was specified) and returns the cached
+        information for this SecurityCenter.
+        '''
+        if not self._cache_file or not os.path.exists(self._cache_file):
+            return dict()
+        try:
+            with open(self._cache_file) as fobj:
+                cache = json.load(fobj)
+        except ValueError:
+            return dict()
+
+        # If the cache was written for a different SecurityCenter, then none
+        # of it is valid for us.
+        if cache.get('url') != self.URL:
+            return dict()
+        return cache
+
+    def _write_cache(self, cache):
+        '''
+        Writes the cache file (if one was specified).  As the cache contains
+        the session token, the file is only readable by the current user.
+        '''
+        if not self._cache_file:
+            return
+        cache['url'] = self.URL
+
+        # The cache is written into a uniquely named temporary file within the
+        # same directory (mkstemp creates it exclusively and only readable by
+        # us, so a pre-placed file or symlink can't be used to redirect the
+        # write) and is then moved over the cache file.
+        fd, tmp = tempfile.mkstemp(
+            dir=os.path.dirname(os.path.abspath(self._cache_file)),
+            prefix='.{}.'.format(os.path.basename(self._cache_file)))
+        try:
+            with os.fdopen(fd, 'w') as fobj:
+                json.dump(cache, fobj)
+            try:
+                os.rename(tmp, self._cache_file)
+            except OSError:
+                # Windows will not rename over an existing file.
+                os.remove(self._cache_file)
+                os.rename(tmp, self._cache_file)
+        except Exception:
+            if os.path.exists(tmp):
+                os.remove(tmp)
+            raise
+
     def _resp_error_check(self, response):
         try:
             d = response.json()
@@ -66,9 +180,47 @@ class SecurityCenter(APISession):
             pass
         return response
 
+    def _request(self, method, path, **kwargs):
+        '''
+        Request call builder.  If the session token that we are using came from
+        the cache and SecurityCenter rejects it, then we will log in again and
+        retry the request once.
+        '''
+        try:
+            return APISession._request(self, method, path, **kwargs)
+        except APIError as err:
+            if (err.code in [401, 403] and self._cached_token and self._creds
+              and path != 'token'):
+                self._cached_token = False
+                self._session.headers.pop('X-SecurityCenter', None)
+                self._session.cookies.clear()
+                self._token_login(*self._creds)
+                return APISession._request(self, method, path, **kwargs)
+            raise
+
+    def _token_login(self, user, passwd):
+        '''
+        Performs the password authentication and caches the resulting token and
+        session cookies.
+        '''
+        resp = self.post('token', json={'username': user, 'password': passwd})
+        token = str(resp.json()['response']['token'])
+        self._session.headers.update({
+            'X-SecurityCenter': token
+        })
+        cache = self._read_cache()
+        cache['token'] = {
+            'user': user,
+            'token': token,
+            'cookies': self._session.cookies.get_dict(),
+        }
+        self._write_cache(cache)
+
     def login(self, user, passwd):
         '''
-        Logs the user into SecurityCenter
+        Logs the user into SecurityCenter.  If a cache file is being used and
+        it holds a session for the same user, then that session is checked with
+        a single inexpensive call and reused if it is still valid.
 
         Args:
             user (str): Username
@@ -77,24 +229,59 @@ class SecurityCenter(APISession):
         Returns:
             None
         '''
-        resp = self.post('token', json={'username': user, 'password': passwd})
-        self._session.headers.update({
-            'X-SecurityCenter': str(resp.json()['response']['token'])
-        })
+        self._creds = (user, passwd)
+        cached = self._read_cache().get('token')
+        if cached and cached['user'] == user:
+            self._session.headers.update({
+                'X-SecurityCenter': cached['token']
+            })
+            self._session.cookies.update(cached['cookies'])
+
+            # We will call the currentUser endpoint directly using the session
+            # to validate the token, as we don't want to re-authenticate here
+            # if it has expired.
+            resp = self._session.get('{}/currentUser'.format(self.URL))
+            try:
+                valid = (resp.status_code == 200
+                    and not resp.json().get('error_code'))
+            except ValueError:
+                valid = False
+            if valid:
+                self._cached_token = True
+                return
+
+            # The cached session is no good, so lets clear it out and log in
+            # normally.
+            self._session.headers.pop('X-SecurityCenter', None)
+            self._session.cookies.clear()
+        self._token_login(user, passwd)
 
     def logout(self):
         '''Logs out of SecurityCenter and removed the cookies and token.'''
         resp = self.delete('token')
         self._build_session()
+        self._creds = None
+        self._cached_token = False
+        cache = self._read_cache()
+        if 'token' in cache:
+            del(cache['token'])
+            self._write_cache(cache)
 
-    def upload(self, fileobj):
+    def upload(self, fileobj, progress=None):
         '''
-        Uploads a file to SecurityCenter
+        Uploads a file to SecurityCenter.  The file is streamed to
+        SecurityCenter as it is being read, so the file is never read into
+        memory all at once.
 
         Args:
             fileobj (obj): The file object to upload into SecurityCenter.
+            progress (function, optional):
+                A function that will be called as ``progress(sent, total)`` as
+                the upload progresses.
         '''
-        return self.post('file/upload', files={'Filedata': fileobj})
+        body = MultipartEncoder([('Filedata', fileobj)], progress=progress)
+        return self.post('file/upload', data=body,
+            headers={'Content-Type': body.content_type})
 
     def analysis(self, *filters, **kwargs):
         '''Analysis
@@ -132,12 +319,25 @@ class SecurityCenter(APISession):
                 The current page in the pagination sequence.  Default is `all`.
             page_size (int, optional): 
                 The page size (number of returned results).  Default is 1000.
+            threads (int, optional):
+                If set to more than 1 when retreiving all pages, then once the
+                first page has informed us of the total number of records, the
+                remaining pages will be fetched concurrently using this many
+                worker threads.  The pages are still returned in order, and all
+                of the threads share the logged-in session.  The default is
+                ``1``.
             func (func, optional):
                 Overload the default behavior and use the provided function 
                 instead.
             func_kw (dict, optional): 
                 If arguments need to be passed to the provided page_func, then
                 provide them as a keyword dictionary.
+            generator (bool, optional):
+                If set to ``True``, a generator will be returned instead of a
+                list.  The generator will return the records as each page is
+                returned from SecurityCenter, so the first record is available
+                after the first call and only one page is held in memory at a
+                time.  The default is ``False``.
             type (str, optional):
                 The type of data that we desire to query against.  While the
                 default is to look at vulnerability data with the 'vuln' type,
@@ -193,14 +393,9 @@ class SecurityCenter(APISession):
                     ``summdmuser``, ``summodel``, ``sumoscpe``, ``sumpluginid``,
                     ``sumprotocol``, ``sumseverity``, ``support``, ``vulndetails``
         '''
-        output = []
         def return_results(**kw):
             return kw['resp']['response']['results']
 
-        def return_generator(**kw):
-            for item in kw['resp']['response']['results']:
-                yield item
-
         # These values are commonly used and/or are generally not changed from 
         # the default. If we do not see them specified by the user then we will
         # need to add these in for later parsing...
@@ -210,12 +405,14 @@ class SecurityCenter(APISession):
         if 'func_kw' not in kwargs: kwargs['func_kw'] = {}
         if 'type' not in kwargs: kwargs['type'] = 'vuln'
         if 'sourceType' not in kwargs: kwargs['sourceType'] = 'cumulative'
-        if 'generator' in kwargs: kwargs['generator'] = return_generator
+        if 'generator' not in kwargs: kwargs['generator'] = False
+        if 'threads' not in kwargs: kwargs['threads'] = 1
 
         # New we need to pull out the options from kwargs as we will be using 
         # kwargs as the basis for the query that will be sent to SecurityCenter.
         opts = {}
-        for opt in ['page', 'page_size', 'func', 'func_kw', 'generator']:
+        for opt in ['page', 'page_size', 'func', 'func_kw', 'generator',
+                    'threads']:
             if opt in kwargs:
                 opts[opt] = kwargs[opt]
                 del kwargs[opt]
@@ -242,22 +439,141 @@ class SecurityCenter(APISession):
                 kwargs['query']['startOffset'] = opts['page'] * opts['page_size']
                 kwargs['query']['endOffset'] = (opts['page'] + 1) * opts['page_size']
 
+        # If a generator was requested, then we will hand the page walker back
+        # to the caller directly so that records are returned as each page
+        # arrives.  Otherwise we will collect all of the records into a list.
+        records = self._analysis_pages(kwargs, opts)
+        if opts['generator']:
+            return records
+        output = [item for item in records]
+        if len(output) > 0:
+            return output
+
+    def aggregate(self, *filters, **kwargs):
+        '''
+        Counts the records matching the filters, grouped by the requested
+        field.  Whenever SecurityCenter has a summary tool for the field (for
+        example ``sumip`` for ``ip``), the counting is done by SecurityCenter
+        and only the summary records are returned.  Otherwise the raw records
+        are streamed from the listing tool and counted locally.
+
+        Args:
+            filters (tuple, optional):
+                The analysis filter tuples.  See :func:`analysis` for details.
+            group_by (str):
+                The field to group the counts by, for example ``ip``,
+                ``pluginID``, or ``severity``.
+            type (str, optional):
+                The type of data to query against.  The default is ``vuln``.
+            page_size (int, optional):
+                The page size to use for the calls.  Default is 1000.
+            threads (int, optional):
+                The number of threads to use for fetching pages.  See
+                :func:`analysis` for details.
+            **kwargs (dict, optional):
+                Any other arguments are passed along to :func:`analysis`, such
+                as ``sourceType``.
+
+        Returns:
+            dict: The counts keyed by the value of the group-by field.
+
+        Examples:
+            >>> sc.aggregate(('severity', '=', '3,4'), group_by='ip')
+        '''
+        if 'group_by' not in kwargs:
+            raise TypeError('aggregate() missing required argument: group_by')
+        group_by = kwargs.pop('group_by')
+        dtype = kwargs.get('type', 'vuln')
+        kwargs['generator'] = True
+
+        def key(value):
+            # Fields such as severity & family are returned as sub-documents,
+            # so we will use the name as the key for those.
+            if isinstance(value, dict):
+                return value.get('name', value.get('id'))
+            return value
+
+        counts = dict()
+        if group_by in self.AGGREGATIONS.get(dtype, {}):
+            # As there is a summary tool for this field, we will let
+            # SecurityCenter do the counting.
+            tool, field, count = self.AGGREGATIONS[dtype][group_by]
+            for item in self.analysis(*filters, tool=tool, **kwargs):
+                k = key(item.get(field))
+                counts[k] = counts.get(k, 0) + int(item.get(count, 0))
+        else:
+            # If there isn't a summary tool for this field, then we will have
+            # to fall back to walking the raw records and counting them here.
+            for item in self.analysis(*filters, tool=self.LIST_TOOLS[dtype],
+                                      **kwargs):
+                k = key(item.get(group_by))
+                counts[k] = counts.get(k, 0) + 1
+        return counts
+
+    def _analysis_pages(self, query, opts):
+        '''
+        Walks through the pages of an analysis query, yielding the records of
+        each page as the page is returned from SecurityCenter.  Only the current
+        page is ever held in memory.
+
+        Args:
+            query (dict): The analysis request document.
+            opts (dict): The pagination and page function options.
+
+        Yields:
+            dict: The analysis records.
+        '''
+        def page_records(resp):
+            # Run the page function against the response and return the
+            # resulting records (if any).
+            opts['func_kw']['resp'] = resp
+            out = opts['func'](**opts['func_kw'])
+            return out if isinstance(out, list) else []
+
         count = 0
         total_records = opts['page_size']
         while total_records > count:
             # Here we actually make the calls.
-            resp = self.post('analysis', json=kwargs).json()
-            opts['func_kw']['resp'] = resp
-            out = opts['func'](**opts['func_kw'])
-            if isinstance(out, list):
-                for item in out:
-                    output.append(item)
-            total_records = int(resp.json()['response']['totalRecords'])
+            resp = self.post('analysis', json=query).json()
+            for item in page_records(resp):
+                yield item
+            total_records = int(resp['response']['totalRecords'])
             if opts['page'] == 'all':
-                count = int(resp.json()['response']['endOffset'])
-                kwargs['query']['startOffset'] = count
-                kwargs['query']['endOffset'] = count + opts['page_size']
+                count = int(resp['response']['endOffset'])
+                query['query']['startOffset'] = count
+                query['query']['endOffset'] = count + opts['page_size']
+
+                if opts['threads'] > 1:
+                    # As we now know how many records there are, we can work
+                    # out the offset windows for the rest of the pages and
+                    # fetch them concurrently.  The windows are returned in
+                    # order, so the records are returned in the same order as
+                    # the serial page walk.
+                    for resp in threaded_map(
+                      lambda start: self._analysis_window(
+                        query, start, opts['page_size']),
+                      range(count, total_records, opts['page_size']),
+                      workers=opts['threads']):
+                        for item in page_records(resp):
+                            yield item
+                    count = total_records
             else:
                 count = total_records
-        if len(output) > 0:
-            return output
+
+    def _analysis_window(self, query, start, size):
+        '''
+        Fetches a single offset window of an analysis query.
+
+        Args:
+            query (dict): The analysis request document.
+            start (int): The starting offset of the window.
+            size (int): The size of the window.
+
+        Returns:
+            dict: The decoded analysis response.
+        '''
+        query = copy.copy(query)
+        query['query'] = copy.copy(query['query'])
+        query['query']['startOffset'] = start
+        query['query']['endOffset'] = start + size
+        return self.post('analysis', json=query).json()
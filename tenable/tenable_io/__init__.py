@@ -5,7 +5,7 @@ from .agent_groups import AgentGroupsAPI
 from .agents import AgentsAPI
 from .assets import AssetsAPI
 from .audit_log import AuditLogAPI
-from .editor import EditorAPI
+from .editor import EditorAPI, EditorCache
 from .exclusions import ExclusionsAPI
 from .file import FileAPI
 from .filters import FiltersAPI
@@ -45,6 +45,16 @@ class TenableIO(APISession):
             If a 429 response is returned, how much do we want to backoff
             if the response didn't send a Retry-After header.  The default
             backoff is ``0.1`` seconds.
+        editor_cache_ttl (int, optional):
+            If specified, the template listings, template details, and the
+            parsed template settings will be cached using an
+            :class:`~tenable.tenable_io.editor.EditorCache`, with each entry
+            expiring after ``editor_cache_ttl`` seconds.  The cache is
+            disabled by default.
+        workbench_cache (LRUCache, optional):
+            If a :class:`~tenable.utils.LRUCache` is passed, then the
+            responses from the workbench asset_info and vuln_info methods will
+            be cached within it.  The cache is disabled by default.
     '''
     
     _TZ = None
@@ -268,9 +278,14 @@ class TenableIO(APISession):
             self._TZ = self.scans.timezones()
         return self._TZ
 
-    def __init__(self, access_key, secret_key, url=None, retries=None, backoff=None):
+    def __init__(self, access_key, secret_key, url=None, retries=None,
+                 backoff=None, editor_cache_ttl=None, workbench_cache=None):
         self._access_key = access_key
         self._secret_key = secret_key
+        self._workbench_cache = workbench_cache
+        self._editor_cache = None
+        if editor_cache_ttl:
+            self._editor_cache = EditorCache(self, editor_cache_ttl)
         APISession.__init__(self, url, retries, backoff)
 
     def _build_session(self):
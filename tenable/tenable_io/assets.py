@@ -1,6 +1,204 @@
-from tenable.tenable_io.base import TIOEndpoint
+from tenable.errors import UnexpectedValueError
+from tenable.tenable_io.base import TIOEndpoint, TIOPoller
+from tenable.utils import threaded_map
+from bisect import bisect_left, bisect_right
+import json, socket, struct, time
+
+
+class AssetMirror(TIOPoller):
+    '''
+    The asset mirror holds a local copy of the asset listing returned from
+    :func:`~tenable.tenable_io.AssetsAPI.list` along with hash indexes on each
+    of the asset identifiers (``ipv4``, ``ipv6``, ``fqdn``, ``mac_address``,
+    and ``netbios_name``) and a sorted index of the IPv4 addresses for CIDR
+    range queries.  Once synced, lookups don't make any API calls.
+
+    Each sync pulls the full asset listing and builds a new set of indexes,
+    which then replaces the current set in one step, so lookups made during a
+    sync will always see a complete (if slightly stale) mirror.  The mirror
+    can either be synced from the caller's own thread (using :func:`sync`), or
+    periodically within a background thread after calling :func:`start`.
+
+    Args:
+        api (TenableIO): The TenableIO object to use.
+        interval (int, optional):
+            The number of seconds between background syncs.  The default is
+            ``3600``.
+
+    Examples:
+        >>> mirror = tio.assets.mirror()
+        >>> mirror.sync()
+        >>> mirror.find('fqdn', 'web01.example.com')
+        >>> mirror.cidr('192.168.0.0/16')
+    '''
+    INDEXES = ['ipv4', 'ipv6', 'fqdn', 'mac_address', 'netbios_name']
+    '''
+    list: The asset identifiers that are indexed.
+    '''
+
+    def __init__(self, api, interval=3600):
+        TIOPoller.__init__(self, api, interval)
+        self._assets = dict()
+        self._indexes = dict([(i, dict()) for i in self.INDEXES])
+        self._ipv4_keys = list()
+        self._ipv4_ids = list()
+        self.last_sync = None
+
+    def _ip2int(self, address):
+        '''
+        Converts a dotted-quad IPv4 address into an integer.
+        '''
+        try:
+            return struct.unpack('!I', socket.inet_aton(address.strip()))[0]
+        except (socket.error, OSError, AttributeError):
+            return None
+
+    def _normalize(self, field, value):
+        '''
+        Normalizes an identifier value so that lookups aren't sensitive to
+        case or to the MAC address separator used.
+        '''
+        value = str(value).strip().lower()
+        if field == 'mac_address':
+            value = value.replace('-', ':')
+        return value
+
+    def _values(self, asset, field):
+        '''
+        Returns the list of values for the identifier on the asset.
+        '''
+        values = asset.get(field)
+        if not values:
+            return list()
+        if not isinstance(values, list):
+            values = [values]
+        return [v for v in values if v]
+
+    def sync(self):
+        '''
+        Pulls the asset listing and rebuilds the mirror.
+
+        Returns:
+            int: The number of assets within the mirror.
+        '''
+        assets = dict()
+        indexes = dict([(i, dict()) for i in self.INDEXES])
+        ipv4 = list()
+        for asset in self._api.assets.list():
+            assets[asset['id']] = asset
+            for field in self.INDEXES:
+                for value in self._values(asset, field):
+                    ids = indexes[field].setdefault(
+                        self._normalize(field, value), list())
+                    if asset['id'] not in ids:
+                        ids.append(asset['id'])
+                    if field == 'ipv4':
+                        addr = self._ip2int(value)
+                        if addr is not None:
+                            ipv4.append((addr, asset['id']))
+        ipv4.sort()
+
+        with self._cond:
+            self._assets = assets
+            self._indexes = indexes
+            self._ipv4_keys = [i[0] for i in ipv4]
+            self._ipv4_ids = [i[1] for i in ipv4]
+            self.last_sync = time.time()
+        return len(assets)
+
+    def _poll(self):
+        self.sync()
+
+    def get(self, uuid):
+        '''
+        Returns the mirrored asset.
+
+        Args:
+            uuid (str): The unique identifier of the asset.
+
+        Returns:
+            dict: The asset record, or None if it isn't in the mirror.
+        '''
+        return self._assets.get(uuid)
+
+    def find(self, field, value):
+        '''
+        Returns the assets with the requested identifier.
+
+        Args:
+            field (str):
+                The identifier to search on.  Must be one of ``ipv4``,
+                ``ipv6``, ``fqdn``, ``mac_address``, or ``netbios_name``.
+            value (str):
+                The identifier value to look for.  FQDNs, netbios names, IPv6
+                and MAC addresses are matched case-insensitively.
+
+        Returns:
+            list: The matching asset records.
+
+        Examples:
+            >>> mirror.find('mac_address', '00:50:56:A1:2B:3C')
+        '''
+        if field not in self.INDEXES:
+            raise UnexpectedValueError(
+                'field must be one of {}'.format(', '.join(self.INDEXES)))
+        with self._cond:
+            assets = self._assets
+            ids = self._indexes[field].get(
+                self._normalize(field, value), list())
+        return [assets[i] for i in ids]
+
+    def cidr(self, network):
+        '''
+        Returns the assets with an IPv4 address within the network.
+
+        Args:
+            network (str):
+                The IPv4 network in CIDR notation (e.g. ``10.0.0.0/8``).  A
+                bare address is treated as a ``/32``.
+
+        Returns:
+            list: The matching asset records, ordered by IPv4 address.
+
+        Examples:
+            >>> for asset in mirror.cidr('172.16.0.0/12'):
+            ...     print(asset['id'], asset['ipv4'])
+        '''
+        address, _, bits = str(network).partition('/')
+        base = self._ip2int(address)
+        try:
+            bits = int(bits) if bits else 32
+        except ValueError:
+            bits = None
+        if base is None or bits is None or not 0 <= bits <= 32:
+            raise UnexpectedValueError(
+                '{} is not a valid IPv4 CIDR network'.format(network))
+        mask = (0xFFFFFFFF << (32 - bits)) & 0xFFFFFFFF
+        low = base & mask
+        high = low | (~mask & 0xFFFFFFFF)
+
+        with self._cond:
+            assets = self._assets
+            keys = self._ipv4_keys
+            ids = self._ipv4_ids
+        resp = list()
+        seen = set()
+        for i in range(bisect_left(keys, low), bisect_right(keys, high)):
+            if ids[i] not in seen:
+                seen.add(ids[i])
+                resp.append(assets[ids[i]])
+        return resp
+
+    def __len__(self):
+        return len(self._assets)
+
 
 class AssetsAPI(TIOEndpoint):
+    IMPORT_ACTIVE_STATUSES = ['PENDING', 'QUEUED', 'PROCESSING', 'RUNNING']
+    '''
+    list: The asset import job statuses that denote the job hasn't finished.
+    '''
+
     def list(self):
         '''
         `assets: list-assets <https://cloud.tenable.com/api#/resources/assets/list-assets>`_
@@ -81,3 +279,177 @@ class AssetsAPI(TIOEndpoint):
                 self._check('uuid', uuid, str)
             )).json()
 
+    def _import_chunks(self, definitions, chunk_size, max_bytes):
+        '''
+        Splits the asset definitions into chunks of no more than chunk_size
+        assets and (approximately) max_bytes of JSON.
+        '''
+        chunk = list()
+        size = 0
+        for asset in definitions:
+            asset_size = len(json.dumps(asset)) + 1
+            if chunk and (len(chunk) >= chunk_size
+              or size + asset_size > max_bytes):
+                yield chunk
+                chunk = list()
+                size = 0
+            chunk.append(asset)
+            size += asset_size
+        if chunk:
+            yield chunk
+
+    def bulk_import(self, definitions, source, chunk_size=1000,
+                    max_bytes=4194304, threads=4, wait=True, interval=5,
+                    max_interval=60, callback=None):
+        '''
+        Imports any number of asset definitions by splitting them into
+        size-bounded chunks, each of which is submitted as its own import job
+        using a bounded pool of threads.  Once all of the chunks have been
+        submitted, the jobs are tracked using :func:`import_job_info` until
+        they have all finished.  The job status checks back off exponentially
+        (up to max_interval) for as long as none of the jobs have finished.
+
+        Args:
+            definitions (iterable):
+                The asset dictionaries to import.  Refer to
+                :func:`asset_import` for details.  As the definitions are
+                chunked as they are read, a generator may be passed.
+            source (str):
+                An identifier to be used to upload the assets.
+            chunk_size (int, optional):
+                The maximum number of assets per import job.  The default is
+                ``1000``.
+            max_bytes (int, optional):
+                The maximum (approximate) size of the JSON assets list per
+                import job.  The default is 4MB.
+            threads (int, optional):
+                The number of chunks to submit concurrently.  The default is
+                ``4``.
+            wait (bool, optional):
+                Should we wait for the import jobs to finish?  The default is
+                ``True``.
+            interval (int, optional):
+                The initial number of seconds between job status checks.  The
+                default is ``5``.
+            max_interval (int, optional):
+                The maximum number of seconds between job status checks.  The
+                default is ``60``.
+            callback (function, optional):
+                A function that is called with the aggregate progress every
+                time a chunk is submitted or a job finishes.  The progress is
+                a dictionary containing the number of ``chunks``, the number of
+                ``assets``, and the number of chunks that have been
+                ``submitted``, have ``finished``, and have ``failed``.
+
+        Returns:
+            list:
+                A dictionary for each chunk containing the chunk ``index``,
+                the ``count`` of assets within it, the ``job_uuid``, the
+                final job ``status``, the last ``job`` record returned from
+                :func:`import_job_info`, and the ``error`` raised when
+                submitting the chunk (if any).
+
+        Examples:
+            >>> results = tio.assets.bulk_import(cmdb_assets(), 'cmdb')
+            >>> failed = [r for r in results if r['error']
+            ...     or r['status'] != 'COMPLETE']
+        '''
+        self._check('source', source, str)
+        self._check('chunk_size', chunk_size, int)
+        self._check('max_bytes', max_bytes, int)
+        self._check('threads', threads, int)
+        self._check('wait', wait, bool)
+        self._check('interval', interval, [int, float])
+        self._check('max_interval', max_interval, [int, float])
+
+        progress = {
+            'chunks': 0,
+            'assets': 0,
+            'submitted': 0,
+            'finished': 0,
+            'failed': 0,
+        }
+
+        def notify():
+            if callback:
+                callback(dict(progress))
+
+        def chunks():
+            for index, chunk in enumerate(self._import_chunks(
+                    definitions, chunk_size, max_bytes)):
+                progress['chunks'] += 1
+                progress['assets'] += len(chunk)
+                yield index, chunk
+
+        def submit(item):
+            index, chunk = item
+            return self._bulk_call({
+                'index': index,
+                'count': len(chunk),
+                'job_uuid': None,
+                'status': None,
+                'job': None,
+                'error': None,
+            }, 'job_uuid', lambda: self.asset_import(chunk, source))
+
+        results = list()
+        for result in threaded_map(submit, chunks(), workers=threads,
+                ordered=False):
+            results.append(result)
+            if result['error']:
+                progress['failed'] += 1
+            else:
+                progress['submitted'] += 1
+            notify()
+        results.sort(key=lambda r: r['index'])
+
+        # Now we will track the jobs until all of them have finished.
+        pending = [r for r in results if r['job_uuid']]
+        delay = interval
+        while wait and pending:
+            time.sleep(delay)
+            finished = list()
+            for result in pending:
+                try:
+                    result['job'] = self.import_job_info(result['job_uuid'])
+                except Exception:
+                    # If we couldn't get the status of the job, we will simply
+                    # try again on the next pass.
+                    continue
+                result['status'] = str(result['job'].get('status')).upper()
+                if result['status'] not in self.IMPORT_ACTIVE_STATUSES:
+                    finished.append(result)
+
+            for result in finished:
+                pending.remove(result)
+                progress['finished'] += 1
+                if result['status'] != 'COMPLETE':
+                    progress['failed'] += 1
+            if finished:
+                notify()
+                delay = interval
+            else:
+                delay = min(delay * 2, max_interval)
+        return results
+
+    def mirror(self, interval=3600):
+        '''
+        Returns an :class:`AssetMirror` for looking up assets locally by their
+        identifiers.
+
+        Args:
+            interval (int, optional):
+                The number of seconds between background syncs.  The default
+                is ``3600``.
+
+        Returns:
+            AssetMirror: The asset mirror.  Call :func:`~AssetMirror.sync`
+            (or :func:`~AssetMirror.start`) to populate it.
+
+        Examples:
+            >>> mirror = tio.assets.mirror()
+            >>> mirror.sync()
+            >>> assets = mirror.find('ipv4', '192.168.1.1')
+        '''
+        return AssetMirror(self._api,
+            self._check('interval', interval, [int, float]))
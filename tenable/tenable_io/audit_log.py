@@ -1,4 +1,215 @@
+from tenable.errors import UnexpectedValueError
 from tenable.tenable_io.base import TIOEndpoint
+import calendar, json, os, threading, time
+
+
+class AuditLogStreamer(object):
+    '''
+    The audit log streamer collects every audit log event exactly once (or, in
+    the case of a crash before the high-water mark is saved, at least once)
+    by walking the audit log in date windows.  Any window that returns as
+    many events as the limit is split in half and re-read until each window
+    fits within the limit.  A full window that is a single second wide is
+    re-read with a larger limit instead, and if the API won't return all of
+    the events within that second, an
+    :class:`~tenable.errors.UnexpectedValueError` is raised without advancing
+    the high-water mark.
+
+    Windows are inclusive of both their first and last second, so each window
+    overlaps the previous one by one second.  The high-water mark records the
+    last second covered along with the ids of the events seen within that
+    second, which are used to drop the duplicates from the overlap.  Events
+    that are received late within the boundary second are therefore still
+    collected on the next pass.  The high-water mark can be persisted to a
+    JSON file so that streaming resumes where it left off.
+
+    Args:
+        api (TenableIO): The TenableIO object to use.
+        path (str, optional):
+            The path of the JSON file to persist the high-water mark within.
+            If left unspecified, the high-water mark is only held in memory.
+        start (int, optional):
+            The epoch timestamp to start from if there isn't a saved
+            high-water mark.  The default is 24 hours ago.
+        window (int, optional):
+            The width (in seconds) of each date window.  The default is
+            ``3600``.
+        limit (int, optional):
+            The number of events to request per window.  The default is
+            ``1000``.
+        lag (int, optional):
+            The number of seconds to stay behind the current time, allowing
+            the audit log to finish recording recent events.  The default is
+            ``60``.
+
+    Examples:
+        >>> streamer = tio.audit_log.streamer('audit.json')
+        >>> for event in streamer.follow():
+        ...     siem.send(event)
+    '''
+    def __init__(self, api, path=None, start=None, window=3600, limit=1000,
+                 lag=60):
+        self._api = api
+        self._path = path
+        self._window = window
+        self._limit = limit
+        self._lag = lag
+        self._cond = threading.Condition()
+        self._running = False
+        self.state = None
+        if path and os.path.exists(path):
+            with open(path) as fobj:
+                self.state = json.load(fobj)
+        if not self.state:
+            if start is None:
+                start = int(time.time()) - 86400
+            self.state = {'date': int(start), 'ids': list()}
+
+    def _fmt(self, timestamp):
+        return time.strftime('%Y-%m-%dT%H:%M:%SZ', time.gmtime(timestamp))
+
+    def _received(self, event):
+        '''
+        Returns the epoch second that the event was received.
+        '''
+        return calendar.timegm(time.strptime(
+            event['received'][:19], '%Y-%m-%dT%H:%M:%S'))
+
+    def _save(self):
+        '''
+        Writes the high-water mark to the state file (if we have one).
+        '''
+        if self._path:
+            part = '{}.part'.format(self._path)
+            with open(part, 'w') as fobj:
+                json.dump(self.state, fobj)
+            try:
+                os.rename(part, self._path)
+            except OSError:
+                # Windows will not rename over an existing file.
+                os.remove(self._path)
+                os.rename(part, self._path)
+
+    def _fetch(self, low, high, limit):
+        '''
+        Returns the events received between the first and last second of the
+        window (inclusive).
+        '''
+        return self._api.audit_log._retry(lambda: self._api.audit_log.events(
+            ('date', 'gt', self._fmt(low - 1)),
+            ('date', 'lt', self._fmt(high + 1)),
+            limit=limit))
+
+    def events(self, until=None):
+        '''
+        Returns a generator of all of the events from the high-water mark
+        until the requested time, in the order that they were received.  The
+        high-water mark is advanced (and saved) after each window.
+
+        Args:
+            until (int, optional):
+                The epoch timestamp to stream until.  The default is the
+                current time minus the lag.
+
+        Returns:
+            generator: The audit log event records.
+        '''
+        if until is None:
+            until = int(time.time()) - self._lag
+        windows = list()
+        low = self.state['date']
+        while low <= until:
+            # The first window always starts on the high-water mark second so
+            # that any events received late within it are still collected.
+            windows.append((low, min(low + self._window, until)))
+            if windows[-1][1] >= until:
+                break
+            low = windows[-1][1]
+        windows.reverse()
+
+        while windows:
+            low, high = windows.pop()
+            limit = self._limit
+            events = self._fetch(low, high, limit)
+            if len(events) >= limit and high > low:
+                # The window is full, so there may be more events than were
+                # returned.  Split it in half and read each half instead.
+                mid = low + (high - low) // 2
+                windows.append((mid + 1, high))
+                windows.append((low, mid))
+                continue
+
+            while len(events) >= limit:
+                # A single second can't be split any further, so we will keep
+                # raising the limit until the events fit.  If the API stops
+                # returning any more of them, then the window would be
+                # truncated, so we will stop here without advancing the
+                # high-water mark rather than leave a gap.
+                limit *= 2
+                more = self._fetch(low, high, limit)
+                if len(more) <= len(events):
+                    raise UnexpectedValueError(
+                        'more than {} audit log events were received at {} '
+                        'and the API will not return them all'.format(
+                            len(events), self._fmt(low)))
+                events = more
+
+            date = self.state['date']
+            seen = set(self.state['ids'])
+            records = list()
+            for event in events:
+                received = self._received(event)
+                if received < date or (received == date
+                  and event.get('id') in seen):
+                    continue
+                records.append((received, event))
+            records.sort(key=lambda r: (r[0], r[1].get('received')))
+            for received, event in records:
+                yield event
+
+            ids = [e.get('id') for r, e in records if r == high]
+            if high == date:
+                ids = list(seen) + ids
+            self.state = {'date': high, 'ids': ids}
+            self._save()
+
+    def follow(self, interval=30, max_interval=600):
+        '''
+        Returns a generator that streams the events and then continues to poll
+        for new events until :func:`stop` is called.  The time between polls
+        doubles (up to max_interval) for each poll that returned no events.
+
+        Args:
+            interval (int, optional):
+                The initial number of seconds between polls.  The default is
+                ``30``.
+            max_interval (int, optional):
+                The maximum number of seconds between polls.  The default is
+                ``600``.
+
+        Returns:
+            generator: The audit log event records.
+        '''
+        self._running = True
+        delay = interval
+        while self._running:
+            found = False
+            for event in self.events():
+                found = True
+                yield event
+            delay = interval if found else min(delay * 2, max_interval)
+            with self._cond:
+                if self._running:
+                    self._cond.wait(delay)
+
+    def stop(self):
+        '''
+        Stops following the audit log.
+        '''
+        with self._cond:
+            self._running = False
+            self._cond.notify_all()
+
 
 class AuditLogAPI(TIOEndpoint):
     def events(self, *filters, **kw):
@@ -31,3 +242,43 @@ class AuditLogAPI(TIOEndpoint):
                 self._check('filter_value', f[2], str)) for f in filters],
             'limit': self._check('limit', kw['limit'], int) if 'limit' in kw else 50
         }).json()['events']
+
+    def streamer(self, path=None, start=None, window=3600, limit=1000,
+                 lag=60):
+        '''
+        Returns an :class:`AuditLogStreamer` for collecting every audit log
+        event without gaps or duplicates.
+
+        Args:
+            path (str, optional):
+                The path of the JSON file to persist the high-water mark
+                within.
+            start (int, optional):
+                The epoch timestamp to start from if there isn't a saved
+                high-water mark.  The default is 24 hours ago.
+            window (int, optional):
+                The width (in seconds) of each date window.  The default is
+                ``3600``.
+            limit (int, optional):
+                The number of events to request per window.  The default is
+                ``1000``.
+            lag (int, optional):
+                The number of seconds to stay behind the current time.  The
+                default is ``60``.
+
+        Returns:
+            AuditLogStreamer: The audit log streamer.
+
+        Examples:
+            >>> streamer = tio.audit_log.streamer('audit.json')
+            >>> for event in streamer.events():
+            ...     print(event['id'], event['action'])
+        '''
+        if path:
+            self._check('path', path, str)
+        if start is not None:
+            self._check('start', start, int)
+        return AuditLogStreamer(self._api, path, start,
+            self._check('window', window, int),
+            self._check('limit', limit, int),
+            self._check('lag', lag, int))
@@ -1,4 +1,7 @@
 from tenable.base import APIResultsIterator, APIEndpoint
+from tenable.errors import APIError
+from requests.exceptions import RequestException
+import threading, time
 
 
 class TIOEndpoint(APIEndpoint):
@@ -59,8 +62,110 @@ class TIOEndpoint(APIEndpoint):
 
         return resp
 
+    def _retry(self, func, retries=2):
+        '''
+        Calls the function, retrying it (with an exponential backoff) up to the
+        number of retries if it raises a server-side or connection error.  As
+        the session already retries the individual HTTP calls, this is meant
+        to retry a whole unit of work within a bulk operation so that a single
+        failure doesn't require the whole operation to be re-run.
+        '''
+        attempt = 0
+        while True:
+            try:
+                return func()
+            except (APIError, RequestException) as err:
+                # Client errors (such as a 404) will never succeed no matter
+                # how often they are retried.
+                if attempt >= retries or (isinstance(err, APIError)
+                  and err.code not in [429, 500, 502, 503, 504]):
+                    raise
+            time.sleep(self._api.RETRY_BACKOFF * (2 ** attempt))
+            attempt += 1
+
+    def _bulk_call(self, result, key, func, limiter=None, retries=2):
+        '''
+        Performs a single unit of work within a bulk operation.  The function
+        is called through :func:`_retry`, waiting on the rate limiter (if any)
+        before every attempt.  The response is stored within the result
+        dictionary using the key, and if the function ultimately fails, then
+        the exception is stored as the ``error`` instead of being raised so
+        that a single failure doesn't stop the rest of the operation.
+
+        Args:
+            result (dict): The result dictionary to update.
+            key (str): The result key to store the response within.
+            func (callable): The function to call.
+            limiter (RateLimiter, optional): The rate limiter to wait on.
+            retries (int, optional): The number of retries.
+
+        Returns:
+            dict: The updated result dictionary.
+        '''
+        def call():
+            if limiter:
+                limiter.wait()
+            return func()
+        try:
+            result[key] = self._retry(call, retries)
+        except Exception as err:
+            result['error'] = err
+        return result
 
 
+class TIOPoller(object):
+    '''
+    The base class for the helpers that poll Tenable.io on an interval, either
+    from the caller's own thread or within a background thread after calling
+    :func:`start`.  Subclasses implement ``_poll()`` and should hold
+    ``_cond`` whenever they touch state shared with the background thread.
+
+    Args:
+        api (TenableIO): The TenableIO object to use.
+        interval (int): The number of seconds between polls.
+    '''
+    def __init__(self, api, interval):
+        self._api = api
+        self._interval = interval
+        self._cond = threading.Condition()
+        self._thread = None
+        self._running = False
+
+    def _poll(self):
+        raise NotImplementedError()
+
+    def _run(self):
+        while self._running:
+            try:
+                self._poll()
+            except Exception:
+                # A failed poll shouldn't kill the background thread, we will
+                # simply try again on the next interval.
+                pass
+            with self._cond:
+                if self._running:
+                    self._cond.wait(self._interval)
+
+    def start(self):
+        '''
+        Starts polling within a background (daemon) thread.
+        '''
+        if not self._running:
+            self._running = True
+            self._thread = threading.Thread(target=self._run)
+            self._thread.daemon = True
+            self._thread.start()
+
+    def stop(self):
+        '''
+        Stops the background thread.
+        '''
+        with self._cond:
+            self._running = False
+            self._cond.notify_all()
+        if self._thread:
+            self._thread.join()
+            self._thread = None
 
 
 class TIOIterator(APIResultsIterator):
@@ -1,42 +1,153 @@
 from tenable.tenable_io.base import TIOEndpoint
-from tenable.utils import dict_merge
+from tenable.utils import dict_merge, threaded_map
 from io import BytesIO
+import copy, threading, time
+
+
+class EditorCache(object):
+    '''
+    A cache for the (rather large and rarely changing) template and editor
+    documents, along with the parsed settings derived from them.  Entries are
+    keyed by the template type and UUID, and every value is returned as a
+    copy so that callers may freely modify what they're handed.
+
+    Entries expire once they are older than the TTL, and are then re-loaded
+    the next time they are requested.  Additionally, the server properties
+    are checked every check_interval seconds, and if the server version or
+    plugin set has changed, then the whole cache is cleared immediately.
+
+    Args:
+        api (TenableIO): The TenableIO object to check the server version with.
+        ttl (int, optional):
+            The number of seconds that an entry is cached for.  The default is
+            ``3600``.
+        check_interval (int, optional):
+            The number of seconds between server version checks.  The default
+            is ``300`` (or the TTL if that is shorter).
+
+    Examples:
+        The cache is generally enabled through the TenableIO object:
+
+        >>> tio = TenableIO('ACCESS_KEY', 'SECRET_KEY', editor_cache_ttl=3600)
+    '''
+    VERSION_KEYS = ['server_version', 'server_build', 'loaded_plugin_set']
+
+    def __init__(self, api, ttl=3600, check_interval=300):
+        self._api = api
+        self._ttl = ttl
+        self._check_interval = min(check_interval, ttl)
+        self._lock = threading.Lock()
+        self._data = dict()
+        self._version = None
+        self._checked = 0
+
+    def _server_version(self):
+        props = self._api.server.properties()
+        return tuple([props.get(k) for k in self.VERSION_KEYS])
+
+    def _validate(self):
+        '''
+        Clears the cache if the server version has changed since we last
+        checked (checking no more than once every check_interval seconds).
+        '''
+        if time.time() - self._checked < self._check_interval:
+            return
+        version = self._server_version()
+        with self._lock:
+            if version != self._version:
+                self._data = dict()
+                self._version = version
+            self._checked = time.time()
+
+    def get(self, key, loader):
+        '''
+        Returns a copy of the cached value for the key.  If the key isn't in
+        the cache (or its entry has expired), then the loader is called and
+        the response is cached.
+
+        Args:
+            key (tuple): The cache key.
+            loader (callable): The function that returns the value to cache.
+
+        Returns:
+            obj: A copy of the cached value.
+        '''
+        self._validate()
+        with self._lock:
+            if key in self._data:
+                stored, value = self._data[key]
+                if time.time() - stored < self._ttl:
+                    return copy.deepcopy(value)
+                del(self._data[key])
+        value = loader()
+        with self._lock:
+            self._data[key] = (time.time(), value)
+        return copy.deepcopy(value)
+
+    def clear(self):
+        '''
+        Removes everything from the cache.
+        '''
+        with self._lock:
+            self._data = dict()
+
 
 class EditorAPI(TIOEndpoint):
+    def _cached(self, key, loader):
+        '''
+        Returns the loader response through the editor cache (if the cache has
+        been enabled).
+        '''
+        cache = getattr(self._api, '_editor_cache', None)
+        if cache is None:
+            return loader()
+        return cache.get(key, loader)
+
     def parse_vals(self, item):
         '''
-        Recursive function to attempt to pull out the various settings from
-        the scan editor.
+        Walks the scan editor document and attempts to pull out the various
+        settings from it.  The document is walked iteratively (depth-first, in
+        document order) and every setting found is written directly into a
+        single response dictionary.  The document passed is left unmodified.
         '''
         resp = dict()
-        if 'id' in item and ('default' in item
-            or ('type' in item and item['type'] in [
-                'file', 
-                'checkbox', 
-                'entry', 
-                'medium-fixed-entry'])):
-            # if we find both an 'id' and a 'default' attribute, or if we find
-            # a 'type' attribute matching one of the known attribute types, then
-            # we will parse out the data and append it to the response dictionary 
-            if not 'default' in item:
-                item['default'] = ""
-            resp[item['id']] = item['default']
-
-        for key in item.keys():
-            # here we will attempt to recurse down both a list of sub-
-            # documents and an explicitly defined sub-document within the
-            # editor data-structure.
-            if key == 'modes':
-                continue
-            if (isinstance(item[key], list) 
-              and len(item[key]) > 0 
-              and isinstance(item[key][0], dict)):
-                for i in item[key]:
-                    resp = dict_merge(resp, self.parse_vals(i))
-            if isinstance(item[key], dict):
-                resp = dict_merge(resp, self.parse_vals(item[key]))
-
-        # Return the key-value pair.
+        stack = [item]
+        while stack:
+            node = stack.pop()
+            if 'id' in node and ('default' in node
+                or node.get('type') in (
+                    'file',
+                    'checkbox',
+                    'entry',
+                    'medium-fixed-entry')):
+                # if we find both an 'id' and a 'default' attribute, or if we
+                # find a 'type' attribute matching one of the known attribute
+                # types, then we will parse out the data and add it to the
+                # response dictionary.
+                value = node.get('default', '')
+                if isinstance(value, dict):
+                    value = copy.deepcopy(value)
+                    if isinstance(resp.get(node['id']), dict):
+                        value = dict_merge(resp[node['id']], value)
+                resp[node['id']] = value
+
+            # here we will queue up both the lists of sub-documents and any
+            # explicitly defined sub-documents within the editor
+            # data-structure.  As the stack is LIFO, the children are pushed
+            # in reverse so that they're walked in document order, meaning
+            # that later settings will overload earlier ones.
+            children = list()
+            for key in node:
+                if key == 'modes':
+                    continue
+                value = node[key]
+                if (isinstance(value, list)
+                  and len(value) > 0
+                  and isinstance(value[0], dict)):
+                    children.extend(value)
+                elif isinstance(value, dict):
+                    children.append(value)
+            stack.extend(reversed(children))
         return resp
 
     def parse_creds(self, data):
@@ -107,35 +218,47 @@ class EditorAPI(TIOEndpoint):
                         })
         return resp 
 
-    def parse_plugins(self, families, id, callfmt='editor/{id}/families/{fam}'):
+    def parse_plugins(self, families, id, callfmt='editor/{id}/families/{fam}',
+                      threads=4):
         '''
         Walks through the plugin settings and will return the the configured
-        settings for a given scan/policy
+        settings for a given scan/policy.  The plugin listings for the mixed
+        families are retrieved concurrently using a bounded pool of threads.
         '''
         resp = dict()
 
+        def mixed(family):
+            # if the plugin family is set to mixed, we will need to get the
+            # currently enabled status of every plugin within the mixed
+            # families.  To do so, we will need to query the scan editor for
+            # each mixed family, getting the plugin listing w/ status an
+            # interpreting that into a simple dictionary of plugin_id:status.
+            plugins = dict()
+            plugs = self._api.get(callfmt.format(
+                id=id, fam=families[family]['id'])).json()['plugins']
+            for plugin in plugs:
+                plugins[plugin['id']] = plugin['status']
+            return family, {
+                'mixedDefault': 'enabled',
+                'status': 'mixed',
+                'individual': plugins,
+            }
+
+        mixed_families = list()
         for family in families:
             if families[family]['status'] != 'mixed':
                 # if the plugin family is wholly enabled or disabled, then
                 # all we need to set is the status.
                 resp[family] = {'status': families[family]['status']}
             else:
-                # if the plugin family is set to mixed, we will need to get
-                # the currently enabled status of every plugin within the
-                # mixed families.  To do so, we will need to query the
-                # scan editor for each mixed family, getting the plugin
-                # listing w/ status an interpreting that into a simple
-                # dictionary of plugin_id:status.
-                plugins = dict()
-                plugs = self._api.get(callfmt.format(
-                    id=id, fam=families[family]['id'])).json()['plugins']
-                for plugin in plugs:
-                    plugins[plugin['id']] = plugin['status']
-                resp[family] = {
-                    'mixedDefault': 'enabled',
-                    'status': 'mixed',
-                    'individual': plugins,
-                }
+                mixed_families.append(family)
+
+        # The mixed families are fetched concurrently.  As the results are
+        # returned in the same order that the families were requested, the
+        # resulting document is the same as if they were fetched serially.
+        for family, settings in threaded_map(mixed, mixed_families,
+                workers=self._check('threads', threads, int)):
+            resp[family] = settings
         return resp
 
     def audits(self, etype, object_id, file_id, fobj=None):
@@ -193,11 +316,11 @@ class EditorAPI(TIOEndpoint):
         Returns:
             dict: Details on the requested template
         '''
-        return self._api.get(
-            'editor/{}/templates/{}'.format(
-                self._check('etype', etype, str, choices=['scan', 'policy']),
-                self._check('uuid', uuid, str)
-            )).json()
+        path = 'editor/{}/templates/{}'.format(
+            self._check('etype', etype, str, choices=['scan', 'policy']),
+            self._check('uuid', uuid, str))
+        return self._cached(('details', etype, uuid),
+            lambda: self._api.get(path).json())
 
     def edit(self, etype, id):
         '''
@@ -231,10 +354,10 @@ class EditorAPI(TIOEndpoint):
         Returns:
             list: Listing of template records.
         '''
-        return self._api.get(
-            'editor/{}/templates'.format(
-                self._check('etype', etype, str, choices=['scan', 'policy'])
-            )).json()['templates']
+        path = 'editor/{}/templates'.format(
+            self._check('etype', etype, str, choices=['scan', 'policy']))
+        return self._cached(('list', etype),
+            lambda: self._api.get(path).json()['templates'])
 
     def plugin_description(self, policy_id, family_id, plugin_id):
         '''
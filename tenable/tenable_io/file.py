@@ -1,19 +1,29 @@
 from tenable.tenable_io.base import TIOEndpoint
+from tenable.utils import MultipartEncoder
 
 class FileAPI(TIOEndpoint):
-    def upload(self, fobj, encrypted=False):
+    def upload(self, fobj, encrypted=False, progress=None):
         '''
         `file: upload <https://cloud.tenable.com/api#/resources/file/upload>`_
 
+        The file is streamed to Tenable.io as it is being read, so the memory
+        used stays the same regardless of the size of the file.
+
         Args:
             fobj (FileObject):
                 The file object intended to be uploaded into Tenable.io.
             encrypted (bool, optional):
                 If the file is encrypted, set the flag to True.
+            progress (function, optional):
+                A function that will be called as ``progress(sent, total)`` as
+                the upload progresses.
 
         Returns:
             str: The fileuploaded attribute
         '''
-        return self._api.post('file/upload', 
-            data={'no_enc': int(encrypted)},
-            files={'Filedata': fobj}).json()['fileuploaded']
\ No newline at end of file
+        body = MultipartEncoder([
+            ('no_enc', int(encrypted)),
+            ('Filedata', fobj),
+        ], progress=progress)
+        return self._api.post('file/upload', data=body,
+            headers={'Content-Type': body.content_type}).json()['fileuploaded']
\ No newline at end of file
@@ -1,4 +1,5 @@
 from tenable.tenable_io.base import TIOEndpoint
+from tenable.utils import dict_merge
 from io import BytesIO
 
 class PoliciesAPI(TIOEndpoint):
@@ -14,7 +15,7 @@ class PoliciesAPI(TIOEndpoint):
             policies[item['name']] = item['uuid']
         return policies
 
-    def template_details(self, name):
+    def template_details(self, name, threads=4):
         '''
         Calls the editor API and parses the policy template config to return a
         document that closely matches what the API expects to be POSTed or PUTed
@@ -24,6 +25,10 @@ class PoliciesAPI(TIOEndpoint):
 
         Args:
             name (str): The name of the scan .
+            threads (int, optional):
+                The number of concurrent requests to use when retreiving the
+                plugin listings for any mixed plugin families.  The default is
+                ``4``.
 
         Returns:
             dict: The policy configuration resource.
@@ -32,17 +37,21 @@ class PoliciesAPI(TIOEndpoint):
         responses from the editor API and isn't guaranteed to work. 
         '''
 
+        self._check('name', name, str)
+        self._check('threads', threads, int)
+
         # Get the policy template UUID
         tmpl = self.templates()
         tmpl_uuid = tmpl[self._check('name', name, str, choices=tmpl.keys())]
 
         # Get the editor object
-        editor = self._api.get('editor/policy/{}'.format(
-            self._check('scan_id', scan_id, int))).json()
+        editor = self._api.editor.details('policy', tmpl_uuid)
 
         # define the initial skeleton of the scan object
         scan = {
-            'settings': self._api.editor.parse_vals(editor['settings']),
+            'settings': self._api.editor._cached(
+                ('settings', 'policy', tmpl_uuid),
+                lambda: self._api.editor.parse_vals(editor['settings'])),
             'uuid': editor['uuid']
         }
 
@@ -89,11 +98,13 @@ class PoliciesAPI(TIOEndpoint):
             # if the plugins sub-document exists, then lets walk down the
             # plugins dataset.
             scan['plugins'] = self._api.editor.parse_plugins(
-                editor['plugins']['families'], scan_id)
+                editor['plugins']['families'], tmpl_uuid,
+                callfmt='editor/policy/templates/{id}/families/{fam}',
+                threads=threads)
 
         # We next need to do a little post-parsing of the ACLs to find the
         # owner and put ownder_id attribute into the appropriate location.
-        for acl in scan['settings']['acls']:
+        for acl in scan['settings'].get('acls', list()):
             if acl['owner'] == 1:
                 scan['settings']['owner_id'] = acl['id']
 
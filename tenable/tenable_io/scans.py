@@ -1,10 +1,486 @@
-from tenable.tenable_io.base import TIOEndpoint
-from tenable.utils import dict_merge
+from tenable.tenable_io.base import TIOEndpoint, TIOPoller
+from tenable.errors import APIError, UnexpectedValueError
+from tenable.utils import dict_merge, threaded_map, RateLimiter
+from requests.exceptions import RequestException
 from datetime import datetime
+from collections import deque
 from io import BytesIO
-import time
+import json, os, sqlite3, threading, time
+
+class ScanCatalog(object):
+    '''
+    The scan catalog is a local SQLite copy of the scan listing that can be
+    queried by folder, owner, status, and schedule without making any API
+    calls.  The catalog is kept up to date incrementally: every
+    :func:`sync` only requests the scans that have been modified since the
+    newest modification that the catalog has seen.  As deleted scans are not
+    returned within an incremental listing, a full resync should be performed
+    periodically to remove them.
+
+    Args:
+        api (TenableIO): The TenableIO object to use.
+        path (str, optional):
+            The path to the SQLite database to store the catalog within.  If
+            the database already contains a catalog, then syncing will resume
+            from where it left off.  The default is ``:memory:``.
+
+    Examples:
+        >>> catalog = tio.scans.catalog('scans.db')
+        >>> catalog.sync()
+        >>> running = catalog.find(status='running')
+    '''
+    COLUMNS = ['id', 'uuid', 'name', 'type', 'owner', 'folder_id', 'status',
+        'enabled', 'rrules', 'starttime', 'timezone', 'creation_date',
+        'last_modification_date']
+    '''
+    list: The attributes of the scan records that are stored as columns.
+    '''
+
+    def __init__(self, api, path=':memory:'):
+        self._api = api
+        self._lock = threading.Lock()
+        self._db = sqlite3.connect(path, check_same_thread=False)
+        with self._db:
+            self._db.execute('CREATE TABLE IF NOT EXISTS scans ({}, record TEXT)'
+                .format(', '.join(['id INTEGER PRIMARY KEY'] + self.COLUMNS[1:])))
+            for col in ['folder_id', 'owner', 'status']:
+                self._db.execute('CREATE INDEX IF NOT EXISTS scans_{0} '
+                    'ON scans ({0})'.format(col))
+            self._db.execute('CREATE INDEX IF NOT EXISTS scans_schedule '
+                'ON scans (enabled, starttime)')
+            self._db.execute('CREATE TABLE IF NOT EXISTS catalog '
+                '(key TEXT PRIMARY KEY, value)')
+
+    def _get_meta(self, key):
+        row = self._db.execute(
+            'SELECT value FROM catalog WHERE key = ?', (key,)).fetchone()
+        return row[0] if row else None
+
+    def sync(self, full=False):
+        '''
+        Brings the catalog up to date.
+
+        Args:
+            full (bool, optional):
+                Should the entire scan listing be retrieved and the catalog
+                rebuilt?  This is the only way to remove deleted scans from
+                the catalog.  The default is ``False``.
+
+        Returns:
+            int: The number of scan records that were stored.
+        '''
+        with self._lock:
+            watermark = None if full else self._get_meta('last_modified')
+            since = None
+            if watermark is not None:
+                # We step back a second so that anything else modified within
+                # the same second as the newest scan isn't missed.
+                since = datetime.fromtimestamp(watermark - 1)
+            scans = self._api.scans.list(last_modified=since)['scans'] or list()
+
+            newest = watermark
+            for scan in scans:
+                mod = scan.get('last_modification_date')
+                if mod and (newest is None or mod > newest):
+                    newest = mod
+
+            with self._db:
+                if full:
+                    self._db.execute('DELETE FROM scans')
+                self._db.executemany(
+                    'INSERT OR REPLACE INTO scans ({}, record) VALUES ({})'.format(
+                        ', '.join(self.COLUMNS),
+                        ', '.join(['?'] * (len(self.COLUMNS) + 1))),
+                    [[s.get(c) for c in self.COLUMNS] + [json.dumps(s)]
+                        for s in scans])
+                if newest is not None:
+                    self._db.execute('INSERT OR REPLACE INTO catalog '
+                        'VALUES (?, ?)', ('last_modified', newest))
+            return len(scans)
+
+    def get(self, scan_id):
+        '''
+        Returns the scan record for the scan.
+
+        Args:
+            scan_id (int): The unique identifier of the scan.
+
+        Returns:
+            dict: The scan record (or ``None`` if it isn't in the catalog).
+        '''
+        with self._lock:
+            row = self._db.execute(
+                'SELECT record FROM scans WHERE id = ?', (scan_id,)).fetchone()
+        return json.loads(row[0]) if row else None
+
+    def find(self, folder_id=None, owner=None, status=None, enabled=None):
+        '''
+        Returns the scan records matching all of the specified attributes.
+
+        Args:
+            folder_id (int, optional): Only return scans within this folder.
+            owner (str, optional): Only return scans owned by this user.
+            status (str or list, optional):
+                Only return scans with this status (or one of these statuses).
+            enabled (bool, optional):
+                Only return scans that have their schedule enabled (or
+                disabled).
+
+        Returns:
+            list: The matching scan records, ordered by scan id.
+        '''
+        where = list()
+        params = list()
+        for col, value in [('folder_id', folder_id), ('owner', owner),
+                           ('enabled', enabled)]:
+            if value is not None:
+                where.append('{} = ?'.format(col))
+                params.append(value)
+        if status is not None:
+            if not isinstance(status, list):
+                status = [status]
+            where.append('status IN ({})'.format(', '.join(['?'] * len(status))))
+            params.extend(status)
+
+        query = 'SELECT record FROM scans'
+        if where:
+            query += ' WHERE {}'.format(' AND '.join(where))
+        with self._lock:
+            rows = self._db.execute(
+                '{} ORDER BY id'.format(query), params).fetchall()
+        return [json.loads(r[0]) for r in rows]
+
+    def scheduled(self, start=None, end=None):
+        '''
+        Returns the scans with an enabled schedule, optionally limited to the
+        scans with a start time within the given range.
+
+        Args:
+            start (str, optional):
+                The earliest start time, formatted as the API returns it
+                (``YYYYMMDDTHHMMSS``).
+            end (str, optional): The latest start time.
+
+        Returns:
+            list: The matching scan records, ordered by start time.
+        '''
+        query = 'SELECT record FROM scans WHERE enabled = 1'
+        params = list()
+        if start:
+            query += ' AND starttime >= ?'
+            params.append(start)
+        if end:
+            query += ' AND starttime <= ?'
+            params.append(end)
+        with self._lock:
+            rows = self._db.execute(
+                '{} ORDER BY starttime'.format(query), params).fetchall()
+        return [json.loads(r[0]) for r in rows]
+
+    def __len__(self):
+        with self._lock:
+            return self._db.execute('SELECT COUNT(*) FROM scans').fetchone()[0]
+
+    def close(self):
+        '''
+        Closes the catalog database.
+        '''
+        self._db.close()
+
+
+class ScanWatcher(TIOPoller):
+    '''
+    The scan watcher tracks the status of any number of scans using a single
+    :func:`~tenable.tenable_io.ScansAPI.list` call per poll.  After the first
+    poll, only the scans that have been modified since the last poll are
+    requested, so the request rate stays constant no matter how many scans
+    are being watched.  Whenever a watched scan changes status the callbacks
+    are called with the scan id, the previous status, the new status, and the
+    scan record as ``callback(scan_id, old, new, scan)``.  Watched scans that
+    aren't returned within a full listing (such as deleted scans) change to
+    the ``missing`` status with a scan record of ``None``.  A full listing is
+    requested on the first poll, after a new scan is watched, and every
+    ``full_every`` polls.
+
+    The watcher can either be polled from the caller's own thread (using
+    :func:`poll` or :func:`wait`), or can poll within a background thread
+    after calling :func:`start`.
+
+    Args:
+        api (TenableIO): The TenableIO object to use.
+        interval (int, optional):
+            The number of seconds between polls.  The default is ``30``.
+        callback (function, optional):
+            A callback to call on every status change of every watched scan.
+        full_every (int, optional):
+            The number of polls between full listings.  The default is ``10``.
+
+    Examples:
+        >>> def changed(scan_id, old, new, scan):
+        ...     print(scan_id, old, new)
+        >>> watcher = tio.scans.watcher(callback=changed)
+        >>> watcher.watch(1)
+        >>> watcher.watch(2)
+        >>> watcher.wait()
+    '''
+    def __init__(self, api, interval=30, callback=None, full_every=10):
+        TIOPoller.__init__(self, api, interval)
+        self._callback = callback
+        self._full_every = full_every
+        self._watched = dict()
+        self._last_modified = None
+        self._generation = 0
+        self._polls = 0
+
+    def watch(self, scan_id, callback=None):
+        '''
+        Starts watching the scan.
+
+        Args:
+            scan_id (int): The unique identifier of the scan.
+            callback (function, optional):
+                A callback to call only for the status changes of this scan.
+        '''
+        with self._cond:
+            if scan_id not in self._watched:
+                self._watched[scan_id] = {'status': None, 'callbacks': list()}
+                # As the status of a newly watched scan may not have changed
+                # since the last poll, the next poll must be a full listing.
+                # The generation tells a poll already in flight not to
+                # advance the watermark past this.
+                self._last_modified = None
+                self._generation += 1
+            if callback:
+                self._watched[scan_id]['callbacks'].append(callback)
+
+    def unwatch(self, scan_id):
+        '''
+        Stops watching the scan.
+
+        Args:
+            scan_id (int): The unique identifier of the scan.
+        '''
+        with self._cond:
+            self._watched.pop(scan_id, None)
+
+    def status(self, scan_id):
+        '''
+        Returns the last known status of a watched scan.
+
+        Args:
+            scan_id (int): The unique identifier of the scan.
+
+        Returns:
+            str:
+                The scan status (or ``None`` if it hasn't been polled yet).  A
+                scan that wasn't returned within a full listing has the status
+                of ``missing``.
+        '''
+        with self._cond:
+            return self._watched[scan_id]['status']
+
+    def poll(self):
+        '''
+        Polls the scan listing once and fires the callbacks for any of the
+        watched scans that have changed status.
+
+        Returns:
+            list: A list of the ``(scan_id, old, new)`` status changes.
+        '''
+        with self._cond:
+            since = self._last_modified
+            if self._polls >= self._full_every:
+                since = None
+            if since is None:
+                self._polls = 0
+            self._polls += 1
+            generation = self._generation
+            watched = set(self._watched)
+        scans = self._api.scans.list(last_modified=since)['scans'] or list()
+
+        changes = list()
+        with self._cond:
+            newest = None
+            for scan in scans:
+                mod = scan.get('last_modification_date')
+                if mod and (newest is None or mod > newest):
+                    newest = mod
+                item = self._watched.get(scan['id'])
+                if item and item['status'] != scan['status']:
+                    changes.append((scan['id'], item['status'], scan['status'],
+                        scan, list(item['callbacks'])))
+                    item['status'] = scan['status']
+
+            # A full listing returns every scan, so any watched scan that
+            # wasn't within it (such as one that was deleted) is marked as
+            # missing.  Otherwise anything waiting on it would wait forever.
+            # Scans watched after the listing was requested are left alone.
+            if since is None:
+                listed = set([scan['id'] for scan in scans])
+                for scan_id, item in self._watched.items():
+                    if (scan_id in watched and scan_id not in listed
+                      and item['status'] != 'missing'):
+                        changes.append((scan_id, item['status'], 'missing',
+                            None, list(item['callbacks'])))
+                        item['status'] = 'missing'
+
+            # We step the watermark back a second so that anything modified
+            # within the same second as the newest scan isn't missed.  As we
+            # only fire on status changes, seeing a scan again is harmless.
+            # If a scan was watched while we were listing, the next poll must
+            # remain a full listing.
+            if generation == self._generation:
+                if newest is not None:
+                    self._last_modified = datetime.fromtimestamp(newest - 1)
+                elif since is None:
+                    self._last_modified = datetime.now()
+            self._cond.notify_all()
+
+        for scan_id, old, new, scan, callbacks in changes:
+            if self._callback:
+                self._callback(scan_id, old, new, scan)
+            for callback in callbacks:
+                callback(scan_id, old, new, scan)
+        return [(c[0], c[1], c[2]) for c in changes]
+
+    def _poll(self):
+        self.poll()
+
+    def _finished(self, scan_ids):
+        return all([self._watched[i]['status'] is not None
+            and self._watched[i]['status'] not in ScansAPI.ACTIVE_STATUSES
+            for i in scan_ids if i in self._watched])
+
+    def wait(self, scan_ids=None, timeout=None):
+        '''
+        Blocks until all of the scans have finished (meaning that their status
+        is no longer one of the ``ACTIVE_STATUSES``).  If the background thread
+        hasn't been started, then we will poll from this thread.
+
+        Args:
+            scan_ids (list, optional):
+                The scans to wait on.  If left unspecified, then we will wait
+                on all of the watched scans.
+            timeout (int, optional):
+                The maximum number of seconds to wait.
+
+        Returns:
+            dict: The last known status of each of the scans.
+        '''
+        with self._cond:
+            if scan_ids is None:
+                scan_ids = list(self._watched.keys())
+        start = time.time()
+        while True:
+            with self._cond:
+                if self._finished(scan_ids):
+                    break
+            remaining = None
+            if timeout is not None:
+                remaining = timeout - (time.time() - start)
+                if remaining <= 0:
+                    break
+            if self._running:
+                with self._cond:
+                    self._cond.wait(remaining)
+            else:
+                self.poll()
+                with self._cond:
+                    if self._finished(scan_ids):
+                        break
+                time.sleep(self._interval if remaining is None
+                    else min(self._interval, remaining))
+        with self._cond:
+            return dict([(i, self._watched[i]['status'])
+                for i in scan_ids if i in self._watched])
+
 
 class ScansAPI(TIOEndpoint):
+    ACTIVE_STATUSES = ['pending', 'initializing', 'running', 'processing',
+        'publishing', 'pausing', 'paused', 'resuming', 'stopping']
+    '''
+    list: The scan statuses that denote that a scan is still occupying the
+    scanner it is running on.
+    '''
+
+    def _create_lookup(self, name, lookups):
+        '''
+        Returns the requested name to UUID listing (either ``templates`` or
+        ``scanners``), retrieving and storing it within the lookups dictionary
+        if we don't already have it.
+        '''
+        if name not in lookups:
+            if name == 'templates':
+                lookups[name] = self._api.policies.templates()
+            elif name == 'scanners':
+                lookups[name] = dict([(i['name'], i['uuid'])
+                    for i in self._api.scanners.list()])
+        return lookups[name]
+
+    def _create_scan_document(self, kw, lookups=None):
+        '''
+        Builds the scan document to POST to the scans API from the keyword
+        arguments that :func:`create` accepts.  The lookups dictionary stores
+        the template and scanner listings so that when many scan documents are
+        being built, each listing only needs to be retrieved once.
+        '''
+        kw = dict(kw)
+        if lookups is None:
+            lookups = dict()
+
+        scan = {
+            'settings': dict(),
+        }
+
+        # If a template is specified, then we will pull the listing of available
+        # templates and set the policy UUID to match the template name given.
+        if 'template' in kw:
+            templates = self._create_lookup('templates', lookups)
+            scan['uuid'] = templates[self._check(
+                'template', kw['template'], str, choices=list(templates.keys()))]
+            del(kw['template'])
+
+        # If a policy UUID is sent, then we will set the scan template UUID to
+        # be the UUID that was specified.
+        if 'policy' in kw:
+            scan['uuid'] = self._check('policy', kw['policy'], 'uuid')
+            del(kw['policy'])
+
+        # If a scanner name is sent, then we will look up the scanner and set
+        # the scanner_id to the UUID of the scanner.
+        if 'scanner' in kw:
+            scanners = self._create_lookup('scanners', lookups)
+            scan['settings']['scanner_id'] = scanners[self._check(
+                'scanner', kw['scanner'], str, choices=list(scanners.keys()))]
+            del(kw['scanner'])
+
+        # If the targets parameter is specified, then we will need to convert
+        # the list of targets to a comma-delimited string and then set the
+        # text_targets paramater with the result.
+        if 'targets' in kw:
+            scan['settings']['text_targets'] = ','.join(self._check(
+                'targets', kw['targets'], list))
+            del(kw['targets'])
+
+        # For credentials, we will simply push the dictionary as-is into the
+        # the credentials.add subdocument.
+        if 'credentials' in kw:
+            scan['credentials'] = {'add': dict()}
+            scan['credentials']['add'] = self._check(
+                'credentials', kw['credentials'], dict)
+            del(kw['credentials'])
+
+        # Just like with credentials, we will push the dictionary as-is into the
+        # correct subdocument of the scan definition.
+        if 'compliance' in kw:
+            scan['audits'] = self._check('compliance', kw['compliance'], dict)
+            del(kw['compliance'])
+
+        # any other remaining keyword arguments will be passed into the settings
+        # subdocument.  The bulk of the data should go here...
+        scan['settings'] = dict_merge(scan['settings'], kw)
+        return scan
+
     def attachment(self, scan_id, attachment_id, key, fobj=None):
         '''
         `scans: attachments <https://cloud.tenable.com/api#/resources/scans/attachments>`_
@@ -38,6 +514,290 @@ class ScansAPI(TIOEndpoint):
         # Return the file object to the ccaller.
         return fobj
 
+    def _bulk_host_details(self, scan_id, host_ids, history_id, threads,
+                           limiter, retries):
+        '''
+        The generator behind :func:`bulk_host_details`.  If no hosts are
+        specified, then the hosts within the scan results will be used.
+        '''
+        if host_ids is None:
+            host_ids = [h['host_id'] for h in self.results(scan_id,
+                history_id=history_id).get('hosts') or list()]
+
+        def fetch(host_id):
+            return self._bulk_call(
+                {'host_id': host_id, 'details': None, 'error': None},
+                'details', lambda: self.host_details(scan_id, host_id,
+                    history_id=history_id), limiter, retries)
+
+        for result in threaded_map(fetch, host_ids, workers=threads,
+                ordered=False):
+            yield result
+
+    def bulk_host_details(self, scan_id, host_ids=None, history_id=None,
+                          threads=4, rate=None, retries=2):
+        '''
+        Retrieves the host details for many hosts within a scan concurrently,
+        returning each result as soon as it is available.
+
+        Args:
+            scan_id (int): The unique identifier for the scan.
+            host_ids (list, optional):
+                The hosts to retrieve.  If left unspecified, then all of the
+                hosts within the scan results will be retrieved.
+            history_id (int, optional):
+                The unique identifier for the instance of the scan.
+            threads (int, optional):
+                The number of concurrent requests to make.  The default is
+                ``4``.
+            rate (float, optional):
+                If specified, the maximum number of requests to make per
+                second across all of the threads.
+            retries (int, optional):
+                The number of times to retry a host that failed with a
+                server-side error.  The default is ``2``.
+
+        Returns:
+            generator:
+                A dictionary for each host containing the ``host_id``, the
+                host ``details``, and the ``error`` (if the host could not be
+                retrieved).  Results are returned in the order they complete.
+
+        Examples:
+            >>> for item in tio.scans.bulk_host_details(1):
+            ...     print(item['host_id'], item['details']['info'])
+        '''
+        self._check('scan_id', scan_id, int)
+        self._check('host_ids', host_ids, list)
+        self._check('history_id', history_id, int)
+        self._check('threads', threads, int)
+        self._check('rate', rate, [int, float])
+        self._check('retries', retries, int)
+        return self._bulk_host_details(scan_id, host_ids, history_id, threads,
+            RateLimiter(rate) if rate else None, retries)
+
+    def bulk_plugin_output(self, scan_id, host_ids=None, plugin_ids=None,
+                           history_id=None, threads=4, rate=None, retries=2):
+        '''
+        Retrieves the plugin output for many host and plugin pairs within a
+        scan concurrently, returning each result as soon as it is available.
+        The host details are retrieved (concurrently) to determine which
+        plugins were reported against each host, and the plugin output
+        requests are started as soon as each host's details are returned.
+
+        Args:
+            scan_id (int): The unique identifier for the scan.
+            host_ids (list, optional):
+                The hosts to retrieve.  If left unspecified, then all of the
+                hosts within the scan results will be retrieved.
+            plugin_ids (list, optional):
+                Only retrieve the output for these plugins.  If left
+                unspecified, the output for every plugin reported against each
+                host will be retrieved.
+            history_id (int, optional):
+                The unique identifier for the instance of the scan.
+            threads (int, optional):
+                The number of concurrent requests to make.  The default is
+                ``4``.
+            rate (float, optional):
+                If specified, the maximum number of requests to make per
+                second across all of the threads.
+            retries (int, optional):
+                The number of times to retry a request that failed with a
+                server-side error.  The default is ``2``.
+
+        Returns:
+            generator:
+                A dictionary for each pair containing the ``host_id``,
+                ``plugin_id``, the plugin ``output``, and the ``error`` (if the
+                output could not be retrieved).  If the host details of a host
+                couldn't be retrieved, then a single result will be returned
+                for the host with a ``plugin_id`` of ``None``.
+
+        Examples:
+            >>> for item in tio.scans.bulk_plugin_output(1, plugin_ids=[19506]):
+            ...     print(item['host_id'], item['output'])
+        '''
+        self._check('scan_id', scan_id, int)
+        self._check('host_ids', host_ids, list)
+        self._check('plugin_ids', plugin_ids, list)
+        self._check('history_id', history_id, int)
+        self._check('threads', threads, int)
+        self._check('rate', rate, [int, float])
+        self._check('retries', retries, int)
+        limiter = RateLimiter(rate) if rate else None
+        hosts = self._bulk_host_details(scan_id, host_ids, history_id, threads,
+            limiter, retries)
+
+        def pairs():
+            for host in hosts:
+                if host['error']:
+                    yield host['host_id'], None, host['error']
+                    continue
+                for vuln in host['details'].get('vulnerabilities') or list():
+                    if not plugin_ids or vuln['plugin_id'] in plugin_ids:
+                        yield host['host_id'], vuln['plugin_id'], None
+
+        def fetch(pair):
+            host_id, plugin_id, error = pair
+            result = {
+                'host_id': host_id,
+                'plugin_id': plugin_id,
+                'output': None,
+                'error': error,
+            }
+            if error:
+                return result
+            return self._bulk_call(result, 'output',
+                lambda: self.plugin_output(scan_id, host_id, plugin_id,
+                    history_id=history_id), limiter, retries)
+
+        return threaded_map(fetch, pairs(), workers=threads, ordered=False)
+
+    def bulk_control(self, scan_ids, action, threads=4):
+        '''
+        Performs the same lifecycle action against many scans concurrently.
+
+        Args:
+            scan_ids (list): The unique identifiers of the scans.
+            action (str):
+                The action to perform.  Must be one of ``launch``, ``pause``,
+                ``resume``, or ``stop``.
+            threads (int, optional):
+                The number of actions to perform concurrently.  The default is
+                ``4``.
+
+        Returns:
+            dict:
+                The error raised for each scan (or ``None`` if successful),
+                keyed by the scan id.
+
+        Examples:
+            >>> errors = tio.scans.bulk_control([1, 2, 3], 'pause')
+        '''
+        self._check('scan_ids', scan_ids, list)
+        self._check('action', action, str,
+            choices=['launch', 'pause', 'resume', 'stop'])
+        self._check('threads', threads, int)
+        func = getattr(self, action)
+
+        def call(scan_id):
+            try:
+                func(scan_id)
+            except Exception as err:
+                return scan_id, err
+            return scan_id, None
+
+        return dict(threaded_map(call, scan_ids, workers=threads))
+
+    def bulk_create(self, definitions, threads=4, rate=None):
+        '''
+        Creates many scans at once.  Every definition is validated and built
+        into a scan document before any of the scans are created, with the
+        template and scanner listings only being retrieved once.  The scans
+        are then created concurrently using a bounded pool of threads.
+
+        Args:
+            definitions (list):
+                A list of dictionaries, each of which contains the keyword
+                arguments that would be passed to :func:`create`.
+            threads (int, optional):
+                The number of scans to create concurrently.  The default is
+                ``4``.
+            rate (float, optional):
+                If specified, the maximum number of scans to create per second
+                across all of the threads.
+
+        Returns:
+            list:
+                A result dictionary for every definition, in the same order as
+                the definitions.  Each result contains the ``index`` and
+                ``definition`` that were passed, the created ``scan`` resource
+                record (or ``None``), the ``error`` that was raised (or
+                ``None``), and the number of seconds the creation took as
+                ``elapsed``.  Definitions that fail validation are never sent
+                to the API.
+
+        Examples:
+            >>> results = tio.scans.bulk_create([
+            ...     {'name': 'Scan 1', 'template': 'basic',
+            ...      'targets': ['192.168.0.0/24']},
+            ...     {'name': 'Scan 2', 'template': 'basic',
+            ...      'targets': ['192.168.1.0/24']},
+            ... ])
+            >>> failed = [r for r in results if r['error']]
+        '''
+        self._check('definitions', definitions, list)
+        self._check('threads', threads, int)
+        self._check('rate', rate, [int, float])
+
+        # Retrieve the listings that the definitions need before validating
+        # them, so that any API errors here are raised to the caller instead of
+        # being reported against every definition.
+        lookups = dict()
+        for definition in definitions:
+            if isinstance(definition, dict):
+                if 'template' in definition:
+                    self._create_lookup('templates', lookups)
+                if 'scanner' in definition:
+                    self._create_lookup('scanners', lookups)
+
+        # Validate all of the definitions and build the scan documents.
+        rows = list()
+        for index, definition in enumerate(definitions):
+            row = {
+                'index': index,
+                'definition': definition,
+                'document': None,
+                'scan': None,
+                'error': None,
+                'elapsed': None,
+            }
+            try:
+                row['document'] = self._create_scan_document(
+                    self._check('definition', definition, dict), lookups)
+            except (TypeError, UnexpectedValueError) as err:
+                row['error'] = err
+            rows.append(row)
+
+        limiter = RateLimiter(rate) if rate else None
+
+        def submit(row):
+            doc = row.pop('document')
+            if doc is None:
+                return row
+            if limiter:
+                limiter.wait()
+            start = time.time()
+
+            # As creating a scan isn't idempotent, it is never retried.
+            self._bulk_call(row, 'scan', lambda: self._api.post('scans',
+                json=doc).json()['scan'], retries=0)
+            row['elapsed'] = time.time() - start
+            return row
+
+        return list(threaded_map(submit, rows, workers=threads))
+
+    def catalog(self, path=':memory:'):
+        '''
+        Returns a :class:`ScanCatalog` for querying the scan listing locally.
+
+        Args:
+            path (str, optional):
+                The path to the SQLite database to store the catalog within.
+                The default is ``:memory:``.
+
+        Returns:
+            ScanCatalog: The scan catalog.  Call
+            :func:`~ScanCatalog.sync` to populate it.
+
+        Examples:
+            >>> catalog = tio.scans.catalog('scans.db')
+            >>> catalog.sync()
+            >>> scans = catalog.find(folder_id=3, status='completed')
+        '''
+        return ScanCatalog(self._api, self._check('path', path, str))
+
     def configure(self, id, scan):
         '''
         `scans: configure <https://cloud.tenable.com/api#/resources/scans/configure>`_
@@ -112,6 +872,9 @@ class ScansAPI(TIOEndpoint):
                 A list of credentials to use.
             compliance (dict, optional):
                 A list of compliance audiots to use.
+            scanner (str, optional):
+                The name of the scanner to use.  The scanner will be looked up
+                and the ``scanner_id`` setting will be set to its UUID.
             **kw (dict, optional):
                 The various parameters that can be passed to the scan creation
                 API.  Examples would be `name`, `email`, `scanner_id`, etc.  For
@@ -121,52 +884,8 @@ class ScansAPI(TIOEndpoint):
         Returns:
             dict: The scan resource record of the newly created scan.
         '''
-        scan = {
-            'settings': dict(),
-        }
-
-        # If a template is specified, then we will pull the listing of available
-        # templates and set the policy UUID to match the template name given.
-        if 'template' in kw:
-            templates = self._api.policies.templates()
-            scan['uuid'] = templates[self._check(
-                'template', kw['template'], str, choices=templates.keys())]
-            del(kw['template'])
-
-        # If a policy UUID is sent, then we will set the scan template UUID to
-        # be the UUID that was specified.
-        if 'policy' in kw:
-            scan['uuid'] = self._check('policy', kw['policy'], 'uuid')
-            del(kw['policy'])
-
-        # If the targets parameter is specified, then we will need to convert
-        # the list of targets to a comma-delimited string and then set the
-        # text_targets paramater with the result.
-        if 'targets' in kw:
-            scan['settings']['text_targets'] = ','.join(self._check(
-                'targets', targets, list))
-            del(kw['targets'])
-
-        # For credentials, we will simply push the dictionary as-is into the
-        # the credentials.add subdocument.
-        if 'credentials' in kw:
-            scan['credentials'] = {'add': dict()}
-            scan['credentials']['add'] = self._check(
-                'credentials', kw['credentials'], dict)
-            del(kw['credentials'])
-
-        # Just like with credentials, we will push the dictionary as-is into the
-        # correct subdocument of the scan definition.
-        if 'compliance' in kw:
-            scan['audits'] = self._check('compliance', compliance, dict)
-            del(kw['compliance'])
-
-        # any other remaining keyword arguments will be passed into the settings
-        # subdocument.  The bulk of the data should go here...
-        scan['settings'] = dict_merge(scan['settings'], kw)
-
-        # Run the API call and return the result to the caller.
-        return self._api.post('scans', json=scan).json()['scan']
+        return self._api.post('scans',
+            json=self._create_scan_document(kw)).json()['scan']
 
     def delete(self, scan_id):
         '''
@@ -195,7 +914,7 @@ class ScansAPI(TIOEndpoint):
             self._check('scan_id', scan_id, int),
             self._check('history_id', history_id, int)))
 
-    def details(self, scan_id):
+    def details(self, scan_id, threads=4):
         '''
         Calls the editor API and parses the scan config details to return a
         document that closely matches what the API expects to be POSTed or PUTed
@@ -205,6 +924,10 @@ class ScansAPI(TIOEndpoint):
 
         Args:
             scan_id (int): The unique identifier for the scan.
+            threads (int, optional):
+                The number of concurrent requests to use when retreiving the
+                plugin listings for any mixed plugin families.  The default is
+                ``4``.
 
         Returns:
             dict: The scan configuration resource.
@@ -213,6 +936,8 @@ class ScansAPI(TIOEndpoint):
         from the editor API and isn't guaranteed to work. 
         '''
 
+        self._check('threads', threads, int)
+
         # Get the editor object
         editor = self._api.get('editor/scan/{}'.format(
             self._check('scan_id', scan_id, int))).json()
@@ -266,7 +991,7 @@ class ScansAPI(TIOEndpoint):
             # if the plugins sub-document exists, then lets walk down the
             # plugins dataset.
             scan['plugins'] = self._api.editor.parse_plugins(
-                editor['plugins']['families'], scan_id)
+                editor['plugins']['families'], scan_id, threads=threads)
 
         # We next need to do a little post-parsing of the ACLs to find the
         # owner and put ownder_id attribute into the appropriate location.
@@ -293,9 +1018,8 @@ class ScansAPI(TIOEndpoint):
         if history_id:
             params['history_id'] = self._check('history_id', history_id, int)
 
-        self._api.get('scans/{}'.format(self._check('scan_id', scan_id, int)),
-            params=params).json()
-
+        return self._api.get('scans/{}'.format(
+            self._check('scan_id', scan_id, int)), params=params).json()
 
     def export(self, scan_id, *filters, **kw):
         '''
@@ -350,6 +1074,9 @@ class ScansAPI(TIOEndpoint):
             params['history_id'] = self._check(
                 'history_id', kw['history_id'], int)
 
+        payload['format'] = self._check('format', kw.get('format'), str,
+            choices=['nessus', 'csv', 'html', 'pdf', 'db'], default='nessus')
+
         if 'password' in kw:
             payload['password'] = self._check('password', kw['password'], str)
 
@@ -401,6 +1128,139 @@ class ScansAPI(TIOEndpoint):
         # Lastly lets return the FileObject to the caller.
         return fobj
 
+    def harvest(self, root, scan_ids=None, format='nessus', threads=4,
+                **kw):
+        '''
+        Exports every completed scan history that hasn't already been
+        harvested into a directory.  A manifest of the harvested histories is
+        kept as a JSON Lines file (``manifest.jsonl``) within the directory, so
+        each run will only export the histories that have completed since the
+        last run.  The exports are written as
+        ``ROOT/SCAN_ID/HISTORY_ID.FORMAT`` and are performed concurrently
+        using a bounded pool of threads.
+
+        Args:
+            root (str): The directory to harvest the exports into.
+            scan_ids (list, optional):
+                The scans to harvest.  If left unspecified, then all of the
+                scans will be harvested.
+            format (str, optional):
+                The export format.  The default is ``nessus``.
+            threads (int, optional):
+                The number of exports to perform concurrently.  The default is
+                ``4``.
+            **kw (dict, optional):
+                Any other keyword arguments (such as ``password`` or
+                ``chapters``) are passed to :func:`export`.
+
+        Returns:
+            list:
+                A dictionary for each history that was exported (or failed to
+                export) containing the ``scan_id``, ``history_id``, ``path``,
+                and ``error``.  Histories that failed will be retried on the
+                next harvest.  A scan whose histories couldn't be retrieved is
+                returned with a ``history_id`` and ``path`` of ``None``.
+
+        Examples:
+            >>> for item in tio.scans.harvest('/data/scans'):
+            ...     if item['error']:
+            ...         print(item['scan_id'], item['history_id'], item['error'])
+        '''
+        self._check('root', root, str)
+        self._check('scan_ids', scan_ids, list)
+        self._check('format', format, str,
+            choices=['nessus', 'csv', 'html', 'pdf', 'db'])
+        self._check('threads', threads, int)
+
+        if not os.path.exists(root):
+            os.makedirs(root)
+        manifest = os.path.join(root, 'manifest.jsonl')
+
+        # Read in the histories that have already been harvested.  Any line
+        # that can't be parsed (such as a partial write) is ignored, which will
+        # simply cause that history to be harvested again.
+        harvested = set()
+        if os.path.exists(manifest):
+            with open(manifest) as fobj:
+                for line in fobj:
+                    try:
+                        item = json.loads(line)
+                        harvested.add((item['scan_id'], item['history_id']))
+                    except (ValueError, KeyError):
+                        pass
+
+        if scan_ids is None:
+            scan_ids = [s['id'] for s in (self.list()['scans'] or list())]
+
+        def histories(scan_id):
+            return self._bulk_call({
+                'scan_id': scan_id,
+                'history_id': None,
+                'path': None,
+                'error': None,
+            }, 'history', lambda: self.results(scan_id).get('history'))
+
+        failed = list()
+
+        def pending():
+            # Retrieve the histories of the scans concurrently, returning the
+            # completed histories that we don't already have.  A scan that we
+            # can't retrieve is reported rather than stopping the harvest.
+            for result in threaded_map(histories, scan_ids, workers=threads):
+                scan_id = result['scan_id']
+                if result['error']:
+                    failed.append(result)
+                    continue
+                for history in result.pop('history') or list():
+                    if (history.get('status') == 'completed'
+                      and (scan_id, history['history_id']) not in harvested):
+                        yield scan_id, history['history_id']
+
+        lock = threading.Lock()
+
+        def harvest(item):
+            scan_id, history_id = item
+            path = os.path.join(root, str(scan_id),
+                '{}.{}'.format(history_id, format))
+            result = {
+                'scan_id': scan_id,
+                'history_id': history_id,
+                'path': path,
+                'error': None,
+            }
+            try:
+                if not os.path.exists(os.path.dirname(path)):
+                    try:
+                        os.makedirs(os.path.dirname(path))
+                    except OSError:
+                        # Another thread may have created it first.
+                        pass
+
+                # The export is written to a temporary file and then moved
+                # into place, so a file at the final path is always complete.
+                with open('{}.part'.format(path), 'wb') as fobj:
+                    self.export(scan_id, history_id=history_id, format=format,
+                        fobj=fobj, **kw)
+                os.rename('{}.part'.format(path), path)
+
+                with lock:
+                    with open(manifest, 'a') as fobj:
+                        fobj.write('{}\n'.format(json.dumps({
+                            'scan_id': scan_id,
+                            'history_id': history_id,
+                            'path': os.path.relpath(path, root),
+                            'size': os.path.getsize(path),
+                            'harvested': int(time.time()),
+                        })))
+            except Exception as err:
+                result['error'] = err
+                if os.path.exists('{}.part'.format(path)):
+                    os.remove('{}.part'.format(path))
+            return result
+
+        return list(threaded_map(harvest, pending(), workers=threads,
+            ordered=False)) + failed
+
     def host_details(self, scan_id, host_id, history_id=None):
         '''
         `scans: host-details <https://cloud.tenable.com/api#/resources/scans/host-details>`_
@@ -477,6 +1337,140 @@ class ScansAPI(TIOEndpoint):
                 self._check('scan_id', scan_id, int)), 
             json=payload).json()['scan_uuid']
 
+    def launch_queue(self, queue, max_per_scanner=1, interval=30, wait=True,
+                     callback=None):
+        '''
+        Launches a queue of scans while keeping the number of scans running on
+        each scanner under a cap.  Every interval the scan statuses are
+        retrieved using a single :func:`list` call and the load of each of the
+        scanners is checked using
+        :func:`~tenable.tenable_io.ScannersAPI.get_scans`.  As soon as a
+        scanner has capacity, the next scan queued for that scanner is
+        launched.
+
+        Args:
+            queue (list):
+                A list of ``(scan_id, scanner_id)`` tuples, in the order that
+                the scans should be launched.
+            max_per_scanner (int, optional):
+                The maximum number of scans that may be running on a scanner at
+                once.  Scans that are already running on the scanner (that were
+                not launched by us) also count against this cap.  The default
+                is ``1``.
+            interval (int, optional):
+                The number of seconds to wait between each status check.  The
+                default is ``30``.
+            wait (bool, optional):
+                Should we wait for the scans we launched to finish before
+                returning?  If set to ``False``, we will return as soon as the
+                last scan in the queue has been launched.  The default is
+                ``True``.
+            callback (function, optional):
+                A function that is called with the scan's result dictionary
+                every time one of the queued scans is launched, fails to
+                launch, or finishes.
+
+        Returns:
+            list:
+                A result dictionary for every queued scan, in the order of the
+                queue.  Each result contains the ``scan_id`` and
+                ``scanner_id``, the ``scan_uuid`` returned from the launch, the
+                ``launched`` and ``finished`` timestamps, the last observed
+                ``status`` (``missing`` if the scan disappeared from the scan
+                listing while running), and any ``error`` raised when
+                launching.
+
+        Examples:
+            >>> results = tio.scans.launch_queue(
+            ...     [(1, 5), (2, 5), (3, 6), (4, 6)], max_per_scanner=2)
+        '''
+        self._check('queue', queue, list)
+        self._check('max_per_scanner', max_per_scanner, int)
+        self._check('interval', interval, [int, float])
+        self._check('wait', wait, bool)
+
+        results = list()
+        pending = dict()
+        for scan_id, scanner_id in queue:
+            result = {
+                'scan_id': self._check('scan_id', scan_id, int),
+                'scanner_id': self._check('scanner_id', scanner_id, int),
+                'scan_uuid': None,
+                'launched': None,
+                'finished': None,
+                'status': 'queued',
+                'error': None,
+            }
+            results.append(result)
+            pending.setdefault(scanner_id, deque()).append(result)
+        running = list()
+        seen_active = set()
+
+        def notify(result):
+            if callback:
+                callback(result)
+
+        while pending or (running and wait):
+            # Retrieve the status of all of the scans in a single call and
+            # work out which of our launched scans have finished.  As the
+            # status of a scan that was just launched may still reflect the
+            # previous run, we will only consider a scan as finished once we
+            # have seen it active, the scan reports the run that we launched,
+            # or it was modified after we launched it.  A scan that is missing
+            # from the listing (such as one that was deleted) will never
+            # finish, so it is treated as finished.
+            if running:
+                scans = dict([(s['id'], s)
+                    for s in (self._retry(self.list)['scans'] or [])])
+                for result in list(running):
+                    scan = scans.get(result['scan_id'])
+                    if scan is None:
+                        result['status'] = 'missing'
+                        result['finished'] = time.time()
+                        running.remove(result)
+                        notify(result)
+                        continue
+                    result['status'] = scan.get('status', result['status'])
+                    if result['status'] in self.ACTIVE_STATUSES:
+                        seen_active.add(result['scan_id'])
+                    elif (result['scan_id'] in seen_active
+                      or scan.get('uuid') == result['scan_uuid']
+                      or scan.get('last_modification_date', 0)
+                      >= result['launched']):
+                        result['finished'] = time.time()
+                        running.remove(result)
+                        notify(result)
+
+            # For every scanner that still has scans queued, work out how much
+            # capacity it has left and launch that many scans.
+            for scanner_id in list(pending):
+                ours = len([r for r in running if r['scanner_id'] == scanner_id])
+                load = max(ours, len(self._retry(
+                    lambda: self._api.scanners.get_scans(scanner_id))
+                    or list()))
+                for i in range(max_per_scanner - load):
+                    if not pending[scanner_id]:
+                        break
+                    result = pending[scanner_id].popleft()
+                    try:
+                        result['scan_uuid'] = self.launch(result['scan_id'])
+                        result['launched'] = time.time()
+                        result['status'] = 'launched'
+                        running.append(result)
+                    except (APIError, RequestException) as err:
+                        # A failed launch (including a connection error)
+                        # only fails this scan, so that we don't lose track
+                        # of the scans that are already running.
+                        result['error'] = err
+                        result['status'] = 'failed'
+                    notify(result)
+                if not pending[scanner_id]:
+                    del(pending[scanner_id])
+
+            if pending or (running and wait):
+                time.sleep(interval)
+        return results
+
     def list(self, folder_id=None, last_modified=None):
         '''
         `scans: list <https://cloud.tenable.com/api#/resources/scans/list>`_
@@ -497,7 +1491,7 @@ class ScansAPI(TIOEndpoint):
             # for the last_modified datetime attribute, we will want to convert
             # that into a timestamp integer before passing it to the API.
             params['last_modified'] = int(time.mktime(self._check(
-                'last_modified', last_modified, datetime)))
+                'last_modified', last_modified, datetime).timetuple()))
 
         return self._api.get('scans', params=params).json()
 
@@ -606,3 +1600,31 @@ class ScansAPI(TIOEndpoint):
         resp = self._api.get('scans/timezones').json()['timezones']
         return [i['value'] for i in resp]
 
+    def watcher(self, interval=30, callback=None, full_every=10):
+        '''
+        Returns a :class:`ScanWatcher` for tracking the status of many scans
+        at once.
+
+        Args:
+            interval (int, optional):
+                The number of seconds between polls.  The default is ``30``.
+            callback (function, optional):
+                A callback to call on every status change of every watched
+                scan as ``callback(scan_id, old, new, scan)``.
+            full_every (int, optional):
+                The number of polls between full listings, which is how
+                deleted scans are detected.  The default is ``10``.
+
+        Returns:
+            ScanWatcher: The scan watcher.
+
+        Examples:
+            >>> watcher = tio.scans.watcher()
+            >>> for scan_id in [1, 2, 3]:
+            ...     watcher.watch(scan_id)
+            >>> statuses = watcher.wait()
+        '''
+        return ScanWatcher(self._api,
+            interval=self._check('interval', interval, [int, float]),
+            callback=callback,
+            full_every=self._check('full_every', full_every, int))
@@ -1,6 +1,33 @@
 from tenable.tenable_io.base import TIOEndpoint
+from tenable.utils import threaded_map, RateLimiter
+from io import BytesIO
+import copy, csv, io, sys, time
 
 class WorkbenchesAPI(TIOEndpoint):
+    CSV_TYPES = {
+        'Plugin ID': int,
+        'Port': int,
+        'CVSS': float,
+        'CVSS Base Score': float,
+        'CVSS Temporal Score': float,
+        'CVSS v3.0 Base Score': float,
+        'CVSS v3.0 Temporal Score': float,
+    }
+    '''
+    dict: The column conversions applied to CSV exports by
+    :func:`export_records`.
+    '''
+
+    def _cached(self, key, loader):
+        '''
+        Returns the loader response through the workbench cache (if the cache
+        has been enabled).
+        '''
+        cache = getattr(self._api, '_workbench_cache', None)
+        if cache is None:
+            return loader()
+        return copy.deepcopy(cache.get(key, loader))
+
     def _workbench_query(self, filters, kw, filterdefs):
         '''
         '''
@@ -23,6 +50,82 @@ class WorkbenchesAPI(TIOEndpoint):
         return query
 
 
+    def _csv_records(self, resp, types):
+        '''
+        Parses the CSV export from the response stream, converting the typed
+        columns as we go.
+        '''
+        if sys.version_info[0] < 3:
+            reader = csv.DictReader(resp.raw)
+        else:
+            # urllib3 marks the response as closed as soon as the body has
+            # been read, which would otherwise cause the text wrapper to fail
+            # before it has worked through its buffer.
+            resp.raw.auto_close = False
+            reader = csv.DictReader(io.TextIOWrapper(
+                resp.raw, encoding='utf-8-sig', newline=''))
+        try:
+            for row in reader:
+                for key, func in types.items():
+                    if key in row:
+                        row[key] = func(row[key]) if row[key] else None
+                yield row
+        finally:
+            resp.close()
+
+    def _export_request(self, filters, kw):
+        '''
+        Requests the export, waits for it to become ready, and returns the
+        file id of the export.
+        '''
+        # initiate the parameters dictionary.
+        params = self._parse_filters(filters,
+            self._api.filters.workbench_vuln_filters())
+
+        params['format'] = self._check('format', kw.get('format'), str,
+            choices=['nessus', 'csv', 'html', 'pdf'], default='nessus')
+
+        if 'plugin_id' in kw:
+            params['plugin_id'] = self._check(
+                'plugin_id', kw['plugin_id'], int)
+
+        if 'asset_uuid' in kw:
+            params['asset_id'] = self._check(
+                'asset_uuid', kw['asset_uuid'], 'uuid')
+
+        if 'chapters' in kw:
+            # The chapters are sent to us in a list, and we need to collapse
+            # that down to a comma-delimited string.
+            params['chapter'] = ';'.join(
+                self._check('chapters', kw['chapters'], list, choices=[
+                    'vuln_hosts_summary', 'vuln_by_host', 'vuln_by_plugin',
+                    'compliance_exec', 'compliance', 'remediations'
+                ]))
+
+        if 'filter_type' in kw:
+            params['filter.search_type'] = self._check(
+                    'filter_type', kw['filter_type'], str)
+
+        # The first thing that we need to do is make the request and get the
+        # File id for the job.
+        fid = self._api.post('workbenches/export',
+            params=params).json()['file']
+
+        # Next we will wait for the statif of the export request to become
+        # ready.  We will query the API every half a second until we get the
+        # response we're looking for.
+        while 'ready' != self._api.get('workbenches/export/{}/status'.format(
+                fid)).json()['status']:
+            time.sleep(0.5)
+        return fid
+
+    def _export_download(self, fid):
+        '''
+        Returns the streaming response for the export download.
+        '''
+        return self._api.get('workbenches/export/{}/download'.format(
+            fid), stream=True)
+
     def assets(self, *filters, **kw):
         '''
         `workbenches: assets <https://cloud.tenable.com/api#/resources/workbenches/assets>`_
@@ -88,8 +191,9 @@ class WorkbenchesAPI(TIOEndpoint):
             # are returning by default.
             del(query['all_fields'])
 
-        return self._api.get('workbenches/assets/{}/info'.format(
-            self._check('id', id, 'uuid')), params=query).json()['info']
+        path = 'workbenches/assets/{}/info'.format(self._check('id', id, 'uuid'))
+        return self._cached(('asset_info', id, all_fields),
+            lambda: self._api.get(path, params=query).json()['info'])
 
     def asset_vulns(self, id, *filters, **kw):
         '''
@@ -155,7 +259,7 @@ class WorkbenchesAPI(TIOEndpoint):
 
         return self._api.get(
             'workbenches/assets/{}/vulnerabilities/{}/info'.format(
-                self._check('uuid', id, 'uuid'),
+                self._check('uuid', uuid, 'uuid'),
                 self._check('plugin_id', plugin_id, int)), params=query).json()['vulnerabilities']
 
     def asset_vuln_output(self, uuid, plugin_id, *filters, **kw):
@@ -190,7 +294,7 @@ class WorkbenchesAPI(TIOEndpoint):
 
         return self._api.get(
             'workbenches/assets/{}/vulnerabilities/{}/outputs'.format(
-                self._check('uuid', id, 'uuid'),
+                self._check('uuid', uuid, 'uuid'),
                 self._check('plugin_id', plugin_id, int)), params=query).json()['vulnerabilities']
 
     def assets_with_vulns(self, *filters, **kw):
@@ -222,6 +326,80 @@ class WorkbenchesAPI(TIOEndpoint):
         return self._api.get(
             'workbenches/assets/vulnerabilities', params=query).json()['assets']
 
+    def bulk(self, method, items, *filters, **kw):
+        '''
+        Calls one of the per-asset or per-plugin workbench methods for many
+        assets or plugins concurrently, returning the results as they complete.
+        Repeated items are only requested once, and every call made shares the
+        same rate budget.
+
+        Args:
+            method (str):
+                The workbench method to call.  Must be one of ``asset_info``,
+                ``asset_vulns``, ``asset_vuln_info``, ``asset_vuln_output``,
+                ``vuln_info``, or ``vuln_outputs``.
+            items (iterable):
+                The items to call the method for.  These are the asset UUIDs
+                for ``asset_info`` and ``asset_vulns``, ``(uuid, plugin_id)``
+                tuples for ``asset_vuln_info`` and ``asset_vuln_output``, and
+                plugin ids for ``vuln_info`` and ``vuln_outputs``.
+            *filters (list, optional):
+                The filters to pass on to each of the calls.
+            threads (int, optional):
+                The number of concurrent calls to make.  The default is ``4``.
+            rate (float or RateLimiter, optional):
+                If specified, the maximum number of calls to make per second
+                across all of the threads.  A
+                :class:`~tenable.utils.RateLimiter` may be passed instead so
+                that the same budget can be shared between multiple bulk calls.
+            retries (int, optional):
+                The number of times to retry an item that failed with a
+                server-side error.  The default is ``2``.
+            **kw (dict, optional):
+                Any other keyword arguments (such as ``age``) are passed on to
+                each of the calls.
+
+        Returns:
+            generator:
+                A dictionary for each unique item containing the ``item``, the
+                ``result`` of the call, and the ``error`` (if the call failed).
+
+        Examples:
+            >>> for item in tio.workbenches.bulk('asset_info', uuids):
+            ...     print(item['item'], item['result'])
+
+            >>> pairs = [(uuid, 19506) for uuid in uuids]
+            >>> for item in tio.workbenches.bulk('asset_vuln_output', pairs):
+            ...     print(item['item'], item['result'])
+        '''
+        self._check('method', method, str, choices=['asset_info',
+            'asset_vulns', 'asset_vuln_info', 'asset_vuln_output',
+            'vuln_info', 'vuln_outputs'])
+        threads = self._check('threads', kw.pop('threads', 4), int)
+        retries = self._check('retries', kw.pop('retries', 2), int)
+        limiter = kw.pop('rate', None)
+        if limiter is not None and not isinstance(limiter, RateLimiter):
+            limiter = RateLimiter(self._check('rate', limiter, [int, float]))
+        func = getattr(self, method)
+
+        def unique():
+            # Only pass on the items that we haven't already seen.
+            seen = set()
+            for item in items:
+                if item not in seen:
+                    seen.add(item)
+                    yield item
+
+        def fetch(item):
+            args = item if isinstance(item, tuple) else (item,)
+            if method != 'asset_info':
+                args += filters
+            return self._bulk_call(
+                {'item': item, 'result': None, 'error': None}, 'result',
+                lambda: func(*args, **kw), limiter, retries)
+
+        return threaded_map(fetch, unique(), workers=threads, ordered=False)
+
     def export(self, *filters, **kw):
         '''
         `workbenches: export <https://cloud.tenable.com/api#/resources/workbenches/export-request>`_
@@ -263,32 +441,6 @@ class WorkbenchesAPI(TIOEndpoint):
             FileObject: The file-like object of the requested export.
         '''
 
-        # initiate the payload and parameters dictionaries.
-        params = self._parse_filters(filters,
-            self._api.filters.workbench_vuln_filters(), rtype='json')
-        #params = dict()
-
-        if 'plugin_id' in kw:
-            params['plugin_id'] = self._check(
-                'plugin_id', kw['plugin_id'], int)
-
-        if 'asset_uuid' in kw:
-            params['asset_id'] = self._check(
-                'asset_uuid', kw['asset_uuid'], 'uuid')   
-
-        if 'chapters' in kw:
-            # The chapters are sent to us in a list, and we need to collapse
-            # that down to a comma-delimited string.
-            params['chapter'] = ';'.join(
-                self._check('chapters', kw['chapters'], list, choices=[
-                    'vuln_hosts_summary', 'vuln_by_host', 'vuln_by_plugin',
-                    'compliance_exec', 'compliance', 'remediations'
-                ]))
-
-        if 'filter_type' in kw:
-            params['filter.search_type'] = self._check(
-                    'filter_type', kw['filter_type'], str)
-
         # Now we need to set the FileObject.  If one was passed to us, then lets
         # just use that, otherwise we will need to instantiate a BytesIO object
         # to push the data into.
@@ -297,22 +449,7 @@ class WorkbenchesAPI(TIOEndpoint):
         else:
             fobj = BytesIO()
 
-        # The first thing that we need to do is make the request and get the
-        # File id for the job.
-        fid = self._api.post('workbenches/export', 
-            params=params).json()['file']
-
-        # Next we will wait for the statif of the export request to become
-        # ready.  We will query the API every half a second until we get the
-        # response we're looking for.
-        while 'ready' != self._api.get('workbenches/export/{}/status'.format(
-                fid)).json()['status']:
-            time.sleep(0.5)
-
-        # Now that the status has reported back as "ready", we can actually
-        # download the file.
-        resp = self._api.get('workbenches/export/{}/download'.format(
-            fid), stream=True)
+        resp = self._export_download(self._export_request(filters, kw))
 
         # Lets stream the file into the file-like object...
         for chunk in resp.iter_content(chunk_size=1024):
@@ -320,6 +457,62 @@ class WorkbenchesAPI(TIOEndpoint):
                 fobj.write(chunk)
         fobj.seek(0)
 
+        # Lastly lets return the FileObject to the caller.
+        return fobj
+
+    def export_records(self, *filters, **kw):
+        '''
+        Requests a workbench export and parses the export as it is being
+        downloaded, returning one record at a time.  As the records are parsed
+        directly from the HTTP response, nothing is written to disk and the
+        memory used stays the same no matter how large the export is.
+
+        Args:
+            *filters (tuple, optional):
+                A list of tuples detailing the filters that wish to be applied
+                the response data.  Refer to :func:`export` for details.
+            asset_uuid (uuid, optional):
+                Restrict the output to the asset identifier specified.
+            plugin_id (int, optional):
+                Restrict the output to the plugin identifier specified.
+            format (str, optional):
+                The export format to request and parse.  Available options are
+                `nessus` and `csv`.  The default is `nessus`.
+            filter_type (str, optional):
+                Are the filters exclusive (this AND this AND this) or inclusive
+                (this OR this OR this).  Valid values are `and` and `or`.  The
+                default setting is `and`.
+            types (dict, optional):
+                For CSV exports, a dictionary of column name to conversion
+                function (such as ``int``).  Empty values within the converted
+                columns are returned as ``None``.  The default is
+                ``CSV_TYPES``.
+
+        Returns:
+            generator:
+                For nessus exports, the records are returned by
+                :class:`~tenable.reports.NessusReportv2`.  For CSV exports, each
+                row is returned as a dictionary keyed by the column names.
+
+        Examples:
+            >>> for row in tio.workbenches.export_records(format='csv'):
+            ...     print(row['Host'], row['Plugin ID'])
+        '''
+        fmt = self._check('format', kw.get('format'), str,
+            choices=['nessus', 'csv'], default='nessus')
+        types = self._check('types', kw.pop('types', None), dict,
+            default=self.CSV_TYPES)
+        kw['format'] = fmt
+        resp = self._export_download(self._export_request(filters, kw))
+
+        # We want the raw response to be decompressed (if the response was
+        # compressed) as we read it.
+        resp.raw.decode_content = True
+        if fmt == 'nessus':
+            from tenable.reports import NessusReportv2
+            return NessusReportv2(resp.raw)
+        return self._csv_records(resp, types)
+
     def vulns(self, *filters, **kw):
         '''
         `workbenches: vulnerability-info <https://cloud.tenable.com/api#/resources/workbenches/vulnerability-info>`_
@@ -395,9 +588,11 @@ class WorkbenchesAPI(TIOEndpoint):
         query = self._workbench_query(filters, kw,
             self._api.filters.workbench_vuln_filters())
 
-        return self._api.get(
-            'workbenches/vulnerabilities/{}/info'.format(
-                self._check('plugin_id', plugin_id, int)), params=query).json()['info']
+        path = 'workbenches/vulnerabilities/{}/info'.format(
+            self._check('plugin_id', plugin_id, int))
+        return self._cached(('vuln_info', plugin_id,
+                tuple(sorted(query.items()))),
+            lambda: self._api.get(path, params=query).json()['info'])
 
     def vuln_outputs(self, plugin_id, *filters, **kw):
         '''
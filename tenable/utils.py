@@ -1,3 +1,12 @@
+from collections import deque, OrderedDict
+from multiprocessing.pool import ThreadPool
+import os, threading, time, uuid
+try:
+    from queue import Queue
+except ImportError:
+    from Queue import Queue
+
+
 def dict_merge(master, updates):
     '''
     Merge 2 dictionaries together  The updates dictionary will be merged into
@@ -15,4 +24,352 @@ def dict_merge(master, updates):
             master[key] = dict_merge(master[key], updates[key])
         else:
             master[key] = updates[key]
-    return master
\ No newline at end of file
+    return master
+
+def threaded_map(func, iterable, workers=4, ordered=True):
+    '''
+    Calls the function for every item within the iterable using a bounded pool
+    of worker threads, returning the results as they are available.  Only a
+    small window of items (twice the number of workers) are ever in flight or
+    waiting to be returned, so the iterable may be of any size.
+
+    If any of the calls raise an exception, then the exception will be raised
+    to the caller when that call's result would have been returned.
+
+    Args:
+        func (function): The function to call for each item.
+        iterable (iterable): The items to pass to the function.
+        workers (int, optional):
+            The number of worker threads to use.  The default is ``4``.
+        ordered (bool, optional):
+            Should the results be returned in the same order as the items
+            within the iterable?  If set to ``False``, then the results are
+            returned as soon as each call completes.  The default is ``True``.
+
+    Returns:
+        generator: The results of each of the calls.
+    '''
+    def call(item):
+        # As exceptions raised within the pool would otherwise be lost, we will
+        # wrap the call and return the exception along with the result.
+        try:
+            return True, func(item)
+        except Exception as err:
+            return False, err
+
+    def result(resp):
+        if not resp[0]:
+            raise resp[1]
+        return resp[1]
+
+    pool = ThreadPool(workers)
+    pending = deque()
+    done = Queue()
+    try:
+        for item in iterable:
+            if ordered:
+                pending.append(pool.apply_async(call, (item,)))
+            else:
+                pending.append(pool.apply_async(call, (item,),
+                    callback=done.put))
+
+            # Once the window is full, we will wait for the oldest call (or
+            # for the next completed call if unordered) before queuing more.
+            if len(pending) >= workers * 2:
+                if ordered:
+                    yield result(pending.popleft().get())
+                else:
+                    pending.pop()
+                    yield result(done.get())
+
+        # Drain whatever is remaining.
+        while pending:
+            if ordered:
+                yield result(pending.popleft().get())
+            else:
+                pending.pop()
+                yield result(done.get())
+    finally:
+        pool.terminate()
+
+
+class RateLimiter(object):
+    '''
+    A thread-safe token bucket rate limiter.  Every call to :func:`wait` takes
+    a token from the bucket, blocking until one is available.  The bucket is
+    refilled at the specified rate, and can hold up to burst tokens, so a
+    single limiter can be shared between any number of threads to keep the
+    total request rate within a budget.
+
+    Args:
+        rate (float): The number of tokens to add to the bucket per second.
+        burst (int, optional):
+            The maximum number of tokens that the bucket can hold.  The default
+            is ``1``.
+
+    Examples:
+        >>> limiter = RateLimiter(5)
+        >>> for item in items:
+        ...     limiter.wait()
+        ...     process(item)
+    '''
+    def __init__(self, rate, burst=1):
+        self._rate = float(rate)
+        self._burst = max(float(burst), 1.0)
+        self._tokens = self._burst
+        self._last = time.time()
+        self._lock = threading.Lock()
+
+    def wait(self):
+        '''
+        Blocks until a token is available and then takes it.
+        '''
+        while True:
+            with self._lock:
+                now = time.time()
+                self._tokens = min(self._burst,
+                    self._tokens + (now - self._last) * self._rate)
+                self._last = now
+                if self._tokens >= 1:
+                    self._tokens -= 1
+                    return
+                delay = (1 - self._tokens) / self._rate
+            time.sleep(delay)
+
+
+class LRUCache(object):
+    '''
+    A thread-safe, size-bounded, least recently used cache with an optional
+    time-to-live for each entry.  When a value is requested that is already
+    being loaded by another thread, the request will wait for (and share) that
+    load rather than making the same call a second time.
+
+    Args:
+        maxsize (int, optional):
+            The maximum number of entries to hold.  Once full, the least
+            recently used entry is evicted.  The default is ``1024``.
+        ttl (int, optional):
+            The number of seconds an entry is valid for.  If left unspecified,
+            entries never expire (but may still be evicted).
+
+    Attributes:
+        hits (int): The number of requests answered from the cache.
+        misses (int): The number of requests that called the loader.
+        coalesced (int):
+            The number of requests that waited on another thread's load of the
+            same key.
+
+    Examples:
+        >>> cache = LRUCache(maxsize=10000, ttl=600)
+        >>> value = cache.get('key', lambda: expensive_call())
+    '''
+    def __init__(self, maxsize=1024, ttl=None):
+        self.maxsize = maxsize
+        self.ttl = ttl
+        self.hits = 0
+        self.misses = 0
+        self.coalesced = 0
+        self._data = OrderedDict()
+        self._inflight = dict()
+        self._lock = threading.Lock()
+
+    def __len__(self):
+        return len(self._data)
+
+    def get(self, key, loader):
+        '''
+        Returns the cached value for the key, calling the loader to get (and
+        cache) the value if we don't have one.  If the loader raises an
+        exception, the exception is raised to every caller waiting on it and
+        nothing is cached.
+
+        Args:
+            key (obj): The (hashable) cache key.
+            loader (function): The function that returns the value to cache.
+
+        Returns:
+            obj: The cached value.
+        '''
+        with self._lock:
+            if key in self._data:
+                expires, value = self._data.pop(key)
+                if expires is None or expires > time.time():
+                    # Re-inserting the entry marks it as the most recently
+                    # used one.
+                    self._data[key] = (expires, value)
+                    self.hits += 1
+                    return value
+            if key in self._inflight:
+                call = self._inflight[key]
+                self.coalesced += 1
+                owner = False
+            else:
+                call = {'event': threading.Event(), 'value': None, 'error': None}
+                self._inflight[key] = call
+                self.misses += 1
+                owner = True
+
+        if not owner:
+            call['event'].wait()
+            if call['error'] is not None:
+                raise call['error']
+            return call['value']
+
+        try:
+            call['value'] = loader()
+        except Exception as err:
+            call['error'] = err
+            raise
+        finally:
+            with self._lock:
+                del(self._inflight[key])
+                if call['error'] is None:
+                    self._data[key] = (time.time() + self.ttl
+                        if self.ttl else None, call['value'])
+                    while len(self._data) > self.maxsize:
+                        self._data.popitem(last=False)
+            call['event'].set()
+        return call['value']
+
+    def clear(self):
+        '''
+        Removes everything from the cache.
+        '''
+        with self._lock:
+            self._data.clear()
+
+
+class MultipartEncoder(object):
+    '''
+    A streaming multipart/form-data encoder.  Instead of building the entire
+    request body in memory (as requests does when using the ``files``
+    parameter), the encoder behaves as a read-only file object that reads the
+    uploaded file in small blocks as the request is being sent.  As the total
+    length is known up front, the request is sent with a Content-Length header
+    and the memory used stays constant regardless of the file size.
+
+    The encoder is also seekable, which allows the underlying HTTP retry logic
+    to rewind the body and resend it if the request needs to be retried.
+
+    Args:
+        fields (list):
+            A list of ``(name, value)`` tuples.  If the value is a tuple, it is
+            treated as a file in the form of ``(filename, fileobj)`` or
+            ``(filename, fileobj, content_type)``.  A file-like object may also
+            be passed directly as the value, and a string may be passed instead
+            of a file-like object.  File objects must be opened in binary mode
+            and must be seekable.
+        progress (function, optional):
+            A function that will be called as ``progress(sent, total)`` every
+            time a block of the body has been read.
+
+    Attributes:
+        content_type (str):
+            The Content-Type header value to send along with the encoder.
+
+    Examples:
+        >>> enc = MultipartEncoder([('Filedata', fobj)])
+        >>> requests.post(url, data=enc,
+        ...     headers={'Content-Type': enc.content_type})
+    '''
+    def __init__(self, fields, progress=None):
+        self._boundary = uuid.uuid4().hex
+        self._progress = progress
+        self._parts = list()
+        self._pos = 0
+        self.content_type = 'multipart/form-data; boundary={}'.format(
+            self._boundary)
+
+        for name, value in fields:
+            filename = None
+            ctype = None
+            if isinstance(value, tuple):
+                filename = value[0]
+                ctype = value[2] if len(value) > 2 else None
+                value = value[1]
+            elif hasattr(value, 'read'):
+                filename = os.path.basename(getattr(value, 'name', name))
+
+            header = '--{}\r\nContent-Disposition: form-data; name="{}"'.format(
+                self._boundary, name)
+            if filename is not None:
+                header += '; filename="{}"\r\nContent-Type: {}'.format(
+                    filename, ctype if ctype else 'application/octet-stream')
+            self._add_bytes('{}\r\n\r\n'.format(header).encode('utf-8'))
+
+            if hasattr(value, 'read'):
+                self._add_file(value)
+            else:
+                if not isinstance(value, bytes):
+                    value = str(value).encode('utf-8')
+                self._add_bytes(value)
+            self._add_bytes(b'\r\n')
+        self._add_bytes('--{}--\r\n'.format(self._boundary).encode('utf-8'))
+        self.len = sum([p['size'] for p in self._parts])
+
+    def _add_bytes(self, data):
+        self._parts.append({'data': data, 'size': len(data)})
+
+    def _add_file(self, fobj):
+        # We will determine the size of the file by seeking to the end of it
+        # and then returning to where the file was positioned initially.
+        start = fobj.tell()
+        fobj.seek(0, 2)
+        size = fobj.tell() - start
+        fobj.seek(start)
+        self._parts.append({'fobj': fobj, 'start': start, 'size': size})
+
+    def __len__(self):
+        return self.len
+
+    def __iter__(self):
+        while True:
+            chunk = self.read(65536)
+            if not chunk:
+                break
+            yield chunk
+
+    def tell(self):
+        return self._pos
+
+    def seek(self, offset, whence=0):
+        if whence == 1:
+            offset += self._pos
+        elif whence == 2:
+            offset += self.len
+        self._pos = max(0, min(offset, self.len))
+        return self._pos
+
+    def read(self, size=-1):
+        '''
+        Reads up to size bytes of the encoded body.
+        '''
+        if size is None or size < 0:
+            size = self.len - self._pos
+        out = list()
+        offset = 0
+        for part in self._parts:
+            if size <= 0:
+                break
+            if self._pos < offset + part['size']:
+                # The current position is within this part, so lets read as
+                # much as we can (up to size) from it.
+                rel = self._pos - offset
+                length = min(size, part['size'] - rel)
+                if 'data' in part:
+                    chunk = part['data'][rel:rel + length]
+                else:
+                    part['fobj'].seek(part['start'] + rel)
+                    chunk = part['fobj'].read(length)
+                out.append(chunk)
+                self._pos += len(chunk)
+                size -= len(chunk)
+                if len(chunk) < length:
+                    # The file was shorter than expected, so we can't
+                    # continue to read from the remaining parts reliably.
+                    break
+            offset += part['size']
+        data = b''.join(out)
+        if self._progress and data:
+            self._progress(self._pos, self.len)
+        return data
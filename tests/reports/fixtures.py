@@ -0,0 +1,66 @@
+import pytest, io
+
+COMPLIANCE_REPORT = b'''<?xml version="1.0" ?>
+<NessusClientData_v2 xmlns:cm="http://www.nessus.org/cm">
+<Report name="compliance">
+<ReportHost name="192.168.0.1"><HostProperties>
+<tag name="host-ip">192.168.0.1</tag>
+<tag name="cpe">cpe:/o:linux:linux_kernel</tag>
+</HostProperties>
+<ReportItem port="0" svc_name="general" protocol="tcp" severity="3" pluginID="21157" pluginName="Unix Compliance Checks" pluginFamily="Policy Compliance">
+<compliance>true</compliance>
+<description>"1.1.1 Ensure mounting of cramfs is disabled": [FAILED]</description>
+<cm:compliance-check-name>1.1.1 Ensure mounting of cramfs is disabled</cm:compliance-check-name>
+<cm:compliance-result>FAILED</cm:compliance-result>
+<plugin_type>local</plugin_type>
+</ReportItem>
+<ReportItem port="0" svc_name="general" protocol="tcp" severity="1" pluginID="21157" pluginName="Unix Compliance Checks" pluginFamily="Policy Compliance">
+<compliance>true</compliance>
+<description>"1.1.2 Ensure separate partition exists for /tmp": [PASSED]</description>
+<cm:compliance-check-name>1.1.2 Ensure separate partition exists for /tmp</cm:compliance-check-name>
+<cm:compliance-result>PASSED</cm:compliance-result>
+<plugin_type>local</plugin_type>
+</ReportItem>
+<ReportItem port="22" svc_name="ssh" protocol="tcp" severity="2" pluginID="10000" pluginName="Example" pluginFamily="General">
+<description>Example description.</description>
+<cpe>cpe:/a:openbsd:openssh</cpe>
+<cvss_base_score>5.0</cvss_base_score>
+<plugin_output>one</plugin_output>
+</ReportItem>
+<ReportItem port="23" svc_name="telnet" protocol="tcp" severity="2" pluginID="10000" pluginName="Example" pluginFamily="General">
+<description>Example description.</description>
+<cpe>cpe:/a:openbsd:openssh</cpe>
+<cvss_base_score>5.0</cvss_base_score>
+<plugin_output>two</plugin_output>
+</ReportItem>
+</ReportHost>
+</Report>
+</NessusClientData_v2>
+'''
+
+@pytest.fixture
+def report():
+    return io.BytesIO(COMPLIANCE_REPORT)
+
+def build_report(items):
+    '''
+    Builds a minimal .nessus report from a list of (host, pluginID, port,
+    cvss_base_score, plugin_output) tuples.
+    '''
+    hosts = list()
+    for host, plugin_id, port, cvss, output in items:
+        if not hosts or hosts[-1][0] != host:
+            hosts.append((host, list()))
+        hosts[-1][1].append(
+            '<ReportItem port="{}" svc_name="general" protocol="tcp" '
+            'severity="2" pluginID="{}" pluginName="Plugin {}" '
+            'pluginFamily="General"><description>Plugin {}</description>'
+            '<cvss_base_score>{}</cvss_base_score>'
+            '<plugin_output>{}</plugin_output></ReportItem>'.format(
+                port, plugin_id, plugin_id, plugin_id, cvss, output))
+    body = ''.join(['<ReportHost name="{}"><HostProperties>'
+        '<tag name="host-ip">{}</tag></HostProperties>{}</ReportHost>'.format(
+            h, h, ''.join(i)) for h, i in hosts])
+    return io.BytesIO('<?xml version="1.0" ?><NessusClientData_v2>'
+        '<Report name="test">{}</Report></NessusClientData_v2>'.format(
+            body).encode('utf-8'))
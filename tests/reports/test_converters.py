@@ -0,0 +1,51 @@
+from .fixtures import *
+from tenable.reports import to_csv, to_jsonl, to_sqlite
+from tenable.reports.converters import CSV_FIELDS
+import csv, json, sqlite3
+
+def test_to_jsonl(report, tmpdir):
+    path = str(tmpdir.join('report.jsonl'))
+    assert to_jsonl(report, path) == 4
+    with open(path) as fobj:
+        items = [json.loads(l) for l in fobj]
+    assert len(items) == 4
+    assert items[1]['description'].startswith('"1.1.2')
+    assert items[2]['plugin_output'] == 'one'
+
+def test_to_csv(report, tmpdir):
+    path = str(tmpdir.join('report.csv'))
+    assert to_csv(report, path, fields=['pluginID', 'port', 'cpe']) == 4
+    with open(path) as fobj:
+        rows = list(csv.DictReader(fobj))
+    assert len(rows) == 4
+    assert rows[2]['port'] == '22'
+    assert rows[2]['cpe'] == 'cpe:/o:linux:linux_kernel\ncpe:/a:openbsd:openssh'
+
+def test_to_sqlite(report, tmpdir):
+    path = str(tmpdir.join('report.db'))
+    assert to_sqlite(report, path, batch_size=3) == 4
+    conn = sqlite3.connect(path)
+    rows = conn.execute(
+        'SELECT pluginID, port, plugin_output, attributes FROM findings'
+    ).fetchall()
+    assert len(rows) == 4
+    assert rows[2][:3] == ('10000', '22', 'one')
+    attrs = json.loads(rows[0][3])
+    assert attrs['cpe'] == 'cpe:/o:linux:linux_kernel'
+    assert attrs['compliance'] == 'true'
+    conn.close()
+
+def test_to_sqlite_unbounded_attributes(tmpdir):
+    items = list()
+    for i in range(100):
+        item = {'pluginID': str(i), 'port': '0'}
+        for p in range(30):
+            item['traceroute-hop-{}-{}'.format(i, p)] = str(p)
+        items.append(item)
+    path = str(tmpdir.join('wide.db'))
+    assert to_sqlite(items, path) == 100
+    conn = sqlite3.connect(path)
+    columns = conn.execute('PRAGMA table_info(findings)').fetchall()
+    assert len(columns) == len(CSV_FIELDS) + 1
+    assert conn.execute('SELECT COUNT(*) FROM findings').fetchone()[0] == 100
+    conn.close()
@@ -0,0 +1,37 @@
+from .fixtures import *
+from tenable.reports import NessusReportDiff
+
+def actions(old, new, **kw):
+    return sorted([(i['action'], i['key']) for i in NessusReportDiff(
+        build_report(old), build_report(new), **kw)])
+
+def test_diff_added_removed_changed():
+    old = [('h1', '1', '0', '5.0', 'a'), ('h1', '2', '0', '5.0', 'a')]
+    new = [('h1', '1', '0', '5.0', 'b'), ('h2', '3', '0', '5.0', 'a')]
+    assert actions(old, new) == [
+        ('added', ('h2', '3', '0', 'tcp')),
+        ('changed', ('h1', '1', '0', 'tcp')),
+        ('removed', ('h1', '2', '0', 'tcp')),
+    ]
+
+def test_diff_plugin_field_changed():
+    old = [('h1', '1', '0', '5.0', 'a')]
+    new = [('h1', '1', '0', '9.0', 'a')]
+    results = list(NessusReportDiff(build_report(old), build_report(new),
+        fields=['cvss_base_score']))
+    assert len(results) == 1
+    assert results[0]['action'] == 'changed'
+    assert results[0]['old']['cvss_base_score'] == '5.0'
+    assert results[0]['new']['cvss_base_score'] == '9.0'
+    assert results[0]['new']['description'] == 'Plugin 1'
+
+def test_diff_unchanged_plugin_fields():
+    old = [('h1', '1', '0', '5.0', 'a')]
+    assert actions(old, old, fields=['cvss_base_score', 'description']) == []
+
+def test_diff_independent_of_memory_limit():
+    old = [('h1', '1', '0', '5.0', 'a'), ('h1', '2', '0', '5.0', 'a'),
+           ('h1', '1', '0', '5.0', 'a')]
+    new = [('h1', '1', '0', '5.0', 'a'), ('h1', '2', '0', '5.0', 'a')]
+    assert actions(old, new, memory_limit=2) == []
+    assert actions(old, new, memory_limit=2) == actions(old, new)
@@ -0,0 +1,39 @@
+from .fixtures import *
+from tenable.reports import NessusReportv2
+
+def test_compliance_items_keep_own_description(report):
+    items = list(NessusReportv2(report))
+    assert items[0]['description'].startswith('"1.1.1')
+    assert items[1]['description'].startswith('"1.1.2')
+    assert items[1]['{http://www.nessus.org/cm}compliance-result'] == 'PASSED'
+    assert items[1]['pluginName'] == 'Unix Compliance Checks'
+
+def test_compliance_items_not_in_plugin_table(report):
+    parser = NessusReportv2(report, plugin_table=True)
+    items = list(parser)
+    assert '21157' not in parser.plugins
+    assert items[1]['description'].startswith('"1.1.2')
+
+def test_host_property_overlap_returns_both(report):
+    items = list(NessusReportv2(report))
+    assert items[2]['cpe'] == [
+        'cpe:/o:linux:linux_kernel', 'cpe:/a:openbsd:openssh']
+    assert items[3]['cpe'] == [
+        'cpe:/o:linux:linux_kernel', 'cpe:/a:openbsd:openssh']
+
+def test_shared_plugin_fields(report):
+    items = list(NessusReportv2(report))
+    assert items[2]['description'] is items[3]['description']
+    assert items[2]['plugin_output'] == 'one'
+    assert items[3]['plugin_output'] == 'two'
+
+def test_plugin_table_graft(report):
+    parser = NessusReportv2(report, plugin_table=True)
+    items = list(parser)
+    assert 'description' not in items[2]
+    assert parser.plugins['10000']['description'] == 'Example description.'
+    item = parser.graft(items[3])
+    assert item['description'] == 'Example description.'
+    assert item['pluginName'] == 'Example'
+    assert item['cpe'] == [
+        'cpe:/o:linux:linux_kernel', 'cpe:/a:openbsd:openssh']
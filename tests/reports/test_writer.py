@@ -0,0 +1,34 @@
+from .fixtures import *
+from tenable.reports import NessusReportv2, NessusReportv2Writer
+
+def roundtrip(items, host_properties):
+    fobj = io.BytesIO()
+    with NessusReportv2Writer(fobj, host_properties=host_properties) as writer:
+        for item in items:
+            writer.write(item)
+    fobj.seek(0)
+    return list(NessusReportv2(fobj))
+
+def test_writer_roundtrip(report):
+    parser = NessusReportv2(report)
+    items = list(parser)
+    assert roundtrip(items, parser.host_properties) == items
+
+def test_writer_roundtrip_shared_host_property_first(report):
+    parser = NessusReportv2(report)
+    items = list(reversed(list(parser)))
+    assert items[0]['cpe'] == [
+        'cpe:/o:linux:linux_kernel', 'cpe:/a:openbsd:openssh']
+    assert roundtrip(items, parser.host_properties) == items
+
+def test_writer_roundtrip_plugin_table(report):
+    parser = NessusReportv2(report, plugin_table=True)
+    items = list(parser)
+    fobj = io.BytesIO()
+    with NessusReportv2Writer(fobj, host_properties=parser.host_properties,
+            plugins=parser.plugins) as writer:
+        for item in items:
+            writer.write(item)
+    fobj.seek(0)
+    assert list(NessusReportv2(fobj)) == list(NessusReportv2(
+        io.BytesIO(COMPLIANCE_REPORT)))
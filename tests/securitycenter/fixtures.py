@@ -0,0 +1,93 @@
+import pytest, json, threading
+try:
+    from http.server import BaseHTTPRequestHandler, HTTPServer
+except ImportError:
+    from BaseHTTPServer import BaseHTTPRequestHandler, HTTPServer
+
+
+class FakeSecurityCenter(HTTPServer):
+    '''
+    A minimal local SecurityCenter that answers the system, token, and
+    currentUser calls, logs every request made, and only accepts the most
+    recently issued token.  Analysis calls are answered from the records
+    stored for each tool, and the query of every analysis call is logged.
+    '''
+    def __init__(self):
+        HTTPServer.__init__(self, ('127.0.0.1', 0), FakeHandler)
+        self.log = list()
+        self.token = 1000
+        self.records = dict()
+        self.queries = list()
+
+    def calls(self, method, path):
+        return len([l for l in self.log if l == (method, path)])
+
+
+class FakeHandler(BaseHTTPRequestHandler):
+    def log_message(self, *args):
+        pass
+
+    def _send(self, data, code=200, cookie=None):
+        body = json.dumps(data).encode('utf-8')
+        self.send_response(code)
+        self.send_header('Content-Type', 'application/json')
+        self.send_header('Content-Length', str(len(body)))
+        if cookie:
+            self.send_header('Set-Cookie', cookie)
+        self.end_headers()
+        self.wfile.write(body)
+
+    def _authed(self):
+        return self.headers.get('X-SecurityCenter') == str(self.server.token)
+
+    def do_GET(self):
+        self.server.log.append(('GET', self.path))
+        if self.path == '/rest/system':
+            return self._send({'error_code': 0, 'response': {
+                'version': '5.7.0', 'buildID': '201805101700',
+                'licenseStatus': 'Valid', 'uuid': 'pytest'}})
+        if not self._authed():
+            return self._send({'error_code': 74, 'error_msg': 'Invalid token',
+                'response': {}}, 403)
+        self._send({'error_code': 0, 'response': {'id': 1}})
+
+    def do_POST(self):
+        body = self.rfile.read(int(self.headers.get('Content-Length') or 0))
+        self.server.log.append(('POST', self.path))
+        if self.path == '/rest/analysis':
+            query = json.loads(body.decode('utf-8'))['query']
+            self.server.queries.append(query)
+            records = self.server.records.get(query['tool'], list())
+            start = query['startOffset']
+            end = min(query['endOffset'], len(records))
+            return self._send({'error_code': 0, 'response': {
+                'totalRecords': str(len(records)),
+                'returnedRecords': max(end - start, 0),
+                'startOffset': str(start),
+                'endOffset': str(end),
+                'results': records[start:end]}})
+        if self.path == '/rest/token':
+            self.server.token += 1
+            return self._send({'error_code': 0,
+                'response': {'token': self.server.token}},
+                cookie='TNS_SESSIONID=pytest; Path=/')
+        self._send({'error_code': 0, 'response': {}})
+
+    def do_DELETE(self):
+        self.server.log.append(('DELETE', self.path))
+        self._send({'error_code': 0, 'response': {}})
+
+
+@pytest.fixture
+def server():
+    srv = FakeSecurityCenter()
+    thread = threading.Thread(target=srv.serve_forever, args=(0.05,))
+    thread.daemon = True
+    thread.start()
+    yield srv
+    srv.shutdown()
+    srv.server_close()
+
+@pytest.fixture
+def cache_file(tmpdir):
+    return str(tmpdir.join('sc.cache'))
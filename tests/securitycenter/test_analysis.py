@@ -0,0 +1,81 @@
+from .fixtures import *
+from tenable.securitycenter import SecurityCenter
+import pytest
+
+@pytest.fixture
+def sc(server, cache_file):
+    sc = SecurityCenter('127.0.0.1', port=server.server_address[1],
+        scheme='http', cache_file=cache_file)
+    sc.login('user', 'pass')
+    return sc
+
+def test_aggregate_requires_group_by(sc):
+    with pytest.raises(TypeError):
+        sc.aggregate(('severity', '=', '4'))
+
+def test_aggregate_summary_tool(sc, server):
+    server.records['sumip'] = [
+        {'ip': '10.0.0.1', 'total': '3'},
+        {'ip': '10.0.0.2', 'total': '5'},
+    ]
+    assert sc.aggregate(('severity', '=', '4'), group_by='ip') == {
+        '10.0.0.1': 3, '10.0.0.2': 5}
+    assert [q['tool'] for q in server.queries] == ['sumip']
+    assert server.queries[0]['filters'][0]['filterName'] == 'severity'
+
+def test_aggregate_summary_count_field(sc, server):
+    server.records['sumseverity'] = [
+        {'severity': {'id': '3', 'name': 'High'}, 'count': '7', 'total': '1'},
+        {'severity': {'id': '4', 'name': 'Critical'}, 'count': '2'},
+    ]
+    assert sc.aggregate(group_by='severity') == {'High': 7, 'Critical': 2}
+
+def test_aggregate_list_tool(sc, server):
+    server.records['listvuln'] = [
+        {'pluginID': '1', 'port': '22'},
+        {'pluginID': '2', 'port': '22'},
+        {'pluginID': '3', 'port': '443'},
+        {'pluginID': '4', 'port': '22'},
+        {'pluginID': '5'},
+    ]
+    assert sc.aggregate(group_by='port', page_size=2) == {
+        '22': 3, '443': 1, None: 1}
+    assert [q['tool'] for q in server.queries] == ['listvuln'] * 3
+
+def test_aggregate_list_tool_dict_keys(sc, server):
+    server.records['listdata'] = [
+        {'family': {'id': '5', 'name': 'General'}},
+        {'family': {'id': '5', 'name': 'General'}},
+        {'family': {'id': '6'}},
+    ]
+    assert sc.aggregate(group_by='family', type='event') == {
+        'General': 2, '6': 1}
+    assert [q['tool'] for q in server.queries] == ['listdata']
+
+def offsets(server):
+    return [(q['startOffset'], q['endOffset']) for q in server.queries]
+
+def test_analysis_generator_is_lazy(sc, server):
+    server.records['listvuln'] = [{'id': i} for i in range(5)]
+    records = sc.analysis(tool='listvuln', page_size=2, generator=True)
+    assert server.calls('POST', '/rest/analysis') == 0
+    assert next(records) == {'id': 0}
+    assert server.calls('POST', '/rest/analysis') == 1
+    assert list(records) == [{'id': i} for i in range(1, 5)]
+    assert offsets(server) == [(0, 2), (2, 4), (4, 6)]
+
+def test_analysis_threads_keeps_order(sc, server):
+    server.records['listvuln'] = [{'id': i} for i in range(23)]
+    assert sc.analysis(tool='listvuln', page_size=3, threads=4) == [
+        {'id': i} for i in range(23)]
+    assert offsets(server)[0] == (0, 3)
+    assert sorted(offsets(server)) == [(i, i + 3) for i in range(0, 23, 3)]
+
+def test_analysis_threads_generator(sc, server):
+    server.records['listvuln'] = [{'id': i} for i in range(7)]
+    records = sc.analysis(tool='listvuln', page_size=2, threads=3,
+        generator=True)
+    assert next(records) == {'id': 0}
+    assert server.calls('POST', '/rest/analysis') == 1
+    assert list(records) == [{'id': i} for i in range(1, 7)]
+    assert sorted(offsets(server)) == [(0, 2), (2, 4), (4, 6), (6, 8)]
@@ -0,0 +1,66 @@
+from .fixtures import *
+from tenable.securitycenter import SecurityCenter
+from tenable.errors import PermissionError
+import os, stat
+
+def connect(server, cache_file):
+    return SecurityCenter('127.0.0.1', port=server.server_address[1],
+        scheme='http', cache_file=cache_file)
+
+def test_cache_file_permissions(server, cache_file):
+    connect(server, cache_file)
+    assert stat.S_IMODE(os.stat(cache_file).st_mode) == 0o600
+
+def test_cache_skips_system_call(server, cache_file):
+    sc = connect(server, cache_file)
+    assert sc.version == '5.7.0'
+    sc = connect(server, cache_file)
+    assert sc.version == '5.7.0'
+    assert server.calls('GET', '/rest/system') == 1
+
+def test_cache_ignores_other_hosts(server, cache_file):
+    connect(server, cache_file)
+    SecurityCenter('localhost', port=server.server_address[1],
+        scheme='http', cache_file=cache_file)
+    assert server.calls('GET', '/rest/system') == 2
+
+def test_cache_reuses_token(server, cache_file):
+    connect(server, cache_file).login('user', 'pass')
+    sc = connect(server, cache_file)
+    sc.login('user', 'pass')
+    assert server.calls('POST', '/rest/token') == 1
+    sc.get('currentUser')
+
+def test_cache_other_user_logs_in(server, cache_file):
+    connect(server, cache_file).login('user', 'pass')
+    connect(server, cache_file).login('other', 'pass')
+    assert server.calls('POST', '/rest/token') == 2
+
+def test_cached_token_relogin(server, cache_file):
+    connect(server, cache_file).login('user', 'pass')
+    sc = connect(server, cache_file)
+    sc.login('user', 'pass')
+
+    # Invalidate the cached token, the next call should log in again and then
+    # retry the call with the new token.
+    server.token += 1
+    assert sc.get('currentUser').json()['response']['id'] == 1
+    assert server.calls('POST', '/rest/token') == 2
+    assert server.calls('GET', '/rest/currentUser') == 3
+
+def test_relogin_only_for_cached_tokens(server, cache_file):
+    sc = connect(server, cache_file)
+    sc.login('user', 'pass')
+    server.token += 1
+    with pytest.raises(PermissionError):
+        sc.get('currentUser')
+    assert server.calls('POST', '/rest/token') == 1
+
+def test_write_cache_ignores_planted_symlink(server, cache_file, tmpdir):
+    victim = tmpdir.join('victim')
+    victim.write('untouched')
+    os.symlink(str(victim), '{}.tmp'.format(cache_file))
+    connect(server, cache_file).login('user', 'pass')
+    assert victim.read() == 'untouched'
+    assert not os.path.islink(cache_file)
+    assert len(tmpdir.listdir()) == 3
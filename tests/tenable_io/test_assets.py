@@ -42,4 +42,43 @@ def test_import_job_info(api):
     jobs = api.assets.import_jobs()
     if len(jobs) > 0:
         job = api.assets.import_job_info(jobs[0]['job_id'])
-        assert job['job_id'] == jobs[0]['job_id']
\ No newline at end of file
+        assert job['job_id'] == jobs[0]['job_id']
+
+def test_bulk_import_source_typeerror(api):
+    with pytest.raises(TypeError):
+        api.assets.bulk_import([{'fqdn': ['example.py.test']}], 1)
+
+def test_bulk_import_chunk_size_typeerror(api):
+    with pytest.raises(TypeError):
+        api.assets.bulk_import([{'fqdn': ['example.py.test']}], 'pytest',
+            chunk_size='1000')
+
+def test_bulk_import_wait_typeerror(api):
+    with pytest.raises(TypeError):
+        api.assets.bulk_import([{'fqdn': ['example.py.test']}], 'pytest',
+            wait='yes')
+
+def test_bulk_import_chunking(api):
+    assets = [{'fqdn': ['host{}.py.test'.format(i)]} for i in range(25)]
+    chunks = list(api.assets._import_chunks(assets, 10, 4194304))
+    assert [len(c) for c in chunks] == [10, 10, 5]
+    chunks = list(api.assets._import_chunks(assets, 1000, 100))
+    assert sum([len(c) for c in chunks]) == 25
+    assert all([len(c) <= 3 for c in chunks])
+
+def test_mirror_interval_typeerror(api):
+    with pytest.raises(TypeError):
+        api.assets.mirror(interval='3600')
+
+def test_mirror_find_field_unexpectedvalueerror(api):
+    with pytest.raises(UnexpectedValueError):
+        api.assets.mirror().find('hostname', 'example.py.test')
+
+def test_mirror_cidr_unexpectedvalueerror(api):
+    with pytest.raises(UnexpectedValueError):
+        api.assets.mirror().cidr('192.168.0.0/33')
+
+def test_mirror(api):
+    mirror = api.assets.mirror()
+    assert mirror.sync() == len(mirror)
+    assert isinstance(mirror.cidr('0.0.0.0/0'), list)
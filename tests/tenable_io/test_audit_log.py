@@ -1,5 +1,6 @@
 from .fixtures import *
 from tenable.errors import *
+import time
 
 def test_event_field_name_typeerror(api):
     with pytest.raises(TypeError):
@@ -22,4 +23,26 @@ def test_events_standard_user_permissionerror(stdapi):
         stdapi.audit_log.events()
 
 def test_events(api):
-    events = api.audit_log.events(('date', 'gt', '2018-01-01'), limit=100)
\ No newline at end of file
+    events = api.audit_log.events(('date', 'gt', '2018-01-01'), limit=100)
+
+def test_streamer_path_typeerror(api):
+    with pytest.raises(TypeError):
+        api.audit_log.streamer(path=1)
+
+def test_streamer_start_typeerror(api):
+    with pytest.raises(TypeError):
+        api.audit_log.streamer(start='2018-01-01')
+
+def test_streamer_window_typeerror(api):
+    with pytest.raises(TypeError):
+        api.audit_log.streamer(window='nope')
+
+def test_streamer_limit_typeerror(api):
+    with pytest.raises(TypeError):
+        api.audit_log.streamer(limit='nope')
+
+def test_streamer(api):
+    streamer = api.audit_log.streamer()
+    events = list(streamer.events())
+    assert isinstance(events, list)
+    assert streamer.state['date'] >= int(time.time()) - 120
@@ -0,0 +1,78 @@
+from tenable.tenable_io.audit_log import AuditLogStreamer
+from tenable.errors import UnexpectedValueError
+import pytest, calendar, copy, time
+
+###
+### The streamer tests replace the fetch with a synthetic audit log, so they
+### don't need API keys.
+###
+
+START = calendar.timegm((2018, 1, 1, 0, 0, 0))
+
+def event(id, offset):
+    return {'id': id, 'received': time.strftime('%Y-%m-%dT%H:%M:%S.000Z',
+        time.gmtime(START + offset))}
+
+def streamer(log, cap=None, **kw):
+    stream = AuditLogStreamer(None, start=START, **kw)
+    stream.calls = list()
+    stream.cap = cap
+
+    def fetch(low, high, limit):
+        stream.calls.append((low - START, high - START, limit))
+        found = [e for e in log if low <= stream._received(e) <= high]
+        return found[:min(limit, stream.cap or limit)]
+    stream._fetch = fetch
+    return stream
+
+def test_streamer_splits_full_windows():
+    log = [event(str(i), i * 10) for i in range(10)]
+    stream = streamer(log, window=100, limit=4)
+    assert list(stream.events(until=START + 100)) == log
+    assert stream.calls[0] == (0, 100, 4)
+    assert (0, 50, 4) in stream.calls
+    assert (51, 100, 4) in stream.calls
+    assert stream.state == {'date': START + 100, 'ids': list()}
+
+def test_streamer_drops_boundary_duplicates():
+    log = [event('a', 10), event('b', 50), event('c', 50)]
+    stream = streamer(log, window=100)
+    assert list(stream.events(until=START + 50)) == log
+    assert stream.state == {'date': START + 50, 'ids': ['b', 'c']}
+
+    # An event received late within the boundary second is still collected
+    # on the next pass, while the ones already seen are dropped.
+    log.append(event('d', 50))
+    log.append(event('e', 70))
+    assert list(stream.events(until=START + 100)) == [log[3], log[4]]
+    assert stream.calls[-1] == (50, 100, 1000)
+    assert stream.state == {'date': START + 100, 'ids': list()}
+
+def test_streamer_raises_limit_within_a_second():
+    log = [event(str(i), 5) for i in range(5)]
+    stream = streamer(log, window=10, limit=2)
+    assert list(stream.events(until=START + 10)) == log
+    assert (5, 5, 8) in stream.calls
+
+def test_streamer_truncated_second_keeps_state():
+    log = [event(str(i), 5) for i in range(5)]
+    stream = streamer(log, cap=2, window=10, limit=2)
+    stream.state = {'date': START + 5, 'ids': ['x']}
+    with pytest.raises(UnexpectedValueError):
+        list(stream.events(until=START + 5))
+    assert stream.state == {'date': START + 5, 'ids': ['x']}
+
+def test_streamer_truncated_second_resumes():
+    log = [event('a', 1)] + [event(str(i), 5) for i in range(5)]
+    stream = streamer(log, cap=2, window=10, limit=2)
+    records = list()
+    with pytest.raises(UnexpectedValueError):
+        for item in stream.events(until=START + 10):
+            records.append(item)
+    assert records == log[:1]
+    assert stream.state['date'] < START + 5
+
+    # Once the API returns the whole second, streaming picks up from the
+    # second that failed without repeating anything.
+    stream.cap = None
+    assert list(stream.events(until=START + 10)) == log[1:]
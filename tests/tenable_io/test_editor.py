@@ -71,4 +71,18 @@ def test_plugin_desc_family_id_typeerror(api):
 
 def test_plugin_desc_plugin_id_typeerror(api):
     with pytest.raises(TypeError):
-        api.editor.plugin_description(1, 1, 'nope')
\ No newline at end of file
+        api.editor.plugin_description(1, 1, 'nope')
+
+def test_parse_plugins_threads_typeerror(api):
+    with pytest.raises(TypeError):
+        api.editor.parse_plugins({}, 1, threads='nope')
+
+def test_list_cached(api):
+    cached = TenableIO(
+        os.environ['TIO_TEST_ADMIN_ACCESS'],
+        os.environ['TIO_TEST_ADMIN_SECRET'],
+        editor_cache_ttl=3600)
+    templates = cached.editor.list('scan')
+    assert isinstance(templates, list)
+    templates.append('modified')
+    assert cached.editor.list('scan') == api.editor.list('scan')
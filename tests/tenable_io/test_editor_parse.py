@@ -0,0 +1,45 @@
+from tenable.tenable_io import TenableIO
+import copy
+
+###
+### The editor document parsers don't make any calls, so these tests are run
+### against a synthetic editor document and don't need API keys.
+###
+
+DOCUMENT = {
+    'settings': {
+        'basic': {
+            'inputs': [
+                {'id': 'name', 'type': 'entry', 'default': 'Basic'},
+                {'id': 'description', 'type': 'textarea'},
+                {'id': 'enabled', 'type': 'checkbox'},
+                {'id': 'options', 'default': {'a': 1, 'b': {'c': 2}}},
+            ],
+            'modes': {
+                'id': 'scan_mode',
+                'default': 'simple',
+                'inputs': [{'id': 'port_range', 'default': 'all'}],
+            },
+        },
+        'advanced': {
+            'groups': [
+                {'inputs': [
+                    {'id': 'name', 'type': 'entry', 'default': 'Advanced'},
+                    {'id': 'options', 'default': {'b': {'d': 3}, 'e': 4}},
+                    {'id': 'upload', 'type': 'file'},
+                ]},
+            ],
+        },
+    },
+}
+
+def test_parse_vals():
+    api = TenableIO('access', 'secret')
+    document = copy.deepcopy(DOCUMENT)
+    assert api.editor.parse_vals(document) == {
+        'name': 'Advanced',
+        'enabled': '',
+        'options': {'a': 1, 'b': {'c': 2, 'd': 3}, 'e': 4},
+        'upload': '',
+    }
+    assert document == DOCUMENT
@@ -3,4 +3,11 @@ from tenable.errors import *
 import uuid
 
 def test_upload(api):
-    api.file.upload((str(uuid.uuid4()), 'ExampleDataGoesHere'))
\ No newline at end of file
+    api.file.upload((str(uuid.uuid4()), 'ExampleDataGoesHere'))
+
+def test_upload_progress(api):
+    calls = list()
+    api.file.upload((str(uuid.uuid4()), 'ExampleDataGoesHere'),
+        progress=lambda sent, total: calls.append((sent, total)))
+    assert len(calls) > 0
+    assert calls[-1][0] == calls[-1][1]
@@ -78,4 +78,12 @@ def test_policy_import(api, policy):
     assert isinstance(resp['id'], int)
 
 def policy_list(api):
-    assert isinstance(api.policies.list(), list)
\ No newline at end of file
+    assert isinstance(api.policies.list(), list)
+
+def test_template_details_name_typeerror(api):
+    with pytest.raises(TypeError):
+        api.policies.template_details(1)
+
+def test_template_details_threads_typeerror(api):
+    with pytest.raises(TypeError):
+        api.policies.template_details('basic', threads='nope')
@@ -15,6 +15,70 @@ def test_attachement_notfounderror(api):
     with pytest.raises(NotFoundError):
         api.scans.attachment(1, 1, 'none')
 
+def test_bulk_host_details_scan_id_typeerror(api):
+    with pytest.raises(TypeError):
+        api.scans.bulk_host_details('nope')
+
+def test_bulk_host_details_host_ids_typeerror(api):
+    with pytest.raises(TypeError):
+        api.scans.bulk_host_details(1, host_ids='nope')
+
+def test_bulk_host_details_notfounderror(api):
+    for item in api.scans.bulk_host_details(1, host_ids=[1]):
+        assert isinstance(item['error'], NotFoundError)
+
+def test_bulk_plugin_output_scan_id_typeerror(api):
+    with pytest.raises(TypeError):
+        api.scans.bulk_plugin_output('nope')
+
+def test_bulk_plugin_output_plugin_ids_typeerror(api):
+    with pytest.raises(TypeError):
+        api.scans.bulk_plugin_output(1, plugin_ids='nope')
+
+def test_bulk_control_scan_ids_typeerror(api):
+    with pytest.raises(TypeError):
+        api.scans.bulk_control('nope', 'pause')
+
+def test_bulk_control_action_unexpectedvalueerror(api):
+    with pytest.raises(UnexpectedValueError):
+        api.scans.bulk_control([1], 'nope')
+
+def test_bulk_control_notfounderror(api):
+    errors = api.scans.bulk_control([1], 'pause')
+    assert isinstance(errors[1], NotFoundError)
+
+def test_bulk_create_definitions_typeerror(api):
+    with pytest.raises(TypeError):
+        api.scans.bulk_create('nope')
+
+def test_bulk_create_threads_typeerror(api):
+    with pytest.raises(TypeError):
+        api.scans.bulk_create([], threads='nope')
+
+def test_bulk_create_rate_typeerror(api):
+    with pytest.raises(TypeError):
+        api.scans.bulk_create([], rate='nope')
+
+def test_bulk_create_invalid_definitions(api):
+    results = api.scans.bulk_create(['nope', {'targets': 'nope'}])
+    assert len(results) == 2
+    for row in results:
+        assert isinstance(row['error'], TypeError)
+        assert row['scan'] == None
+
+def test_catalog_path_typeerror(api):
+    with pytest.raises(TypeError):
+        api.scans.catalog(1)
+
+def test_catalog_sync(api):
+    catalog = api.scans.catalog()
+    count = catalog.sync()
+    assert len(catalog) == count
+    for scan in catalog.find():
+        assert catalog.get(scan['id']) == scan
+    catalog.sync()
+    assert catalog.sync(full=True) == len(catalog)
+
 #def test_configure_scan_id_typeerror(api):
 #    with pytest.raises(TypeError):
 #        api.scans.configure('nope')
@@ -86,6 +150,10 @@ def test_details_history_it_typeerror(api):
     with pytest.raises(TypeError):
         api.scans.details(1, 'nope')
 
+def test_details_threads_typeerror(api):
+    with pytest.raises(TypeError):
+        api.scans.details(1, threads='nope')
+
 @pytest.mark.skip(reason="Need scan data to test")
 def test_details(api):
     pass
@@ -94,6 +162,18 @@ def test_details(api):
 ### Add Export tests here...
 ###
 
+def test_harvest_root_typeerror(api):
+    with pytest.raises(TypeError):
+        api.scans.harvest(1)
+
+def test_harvest_scan_ids_typeerror(api):
+    with pytest.raises(TypeError):
+        api.scans.harvest('/tmp', scan_ids='nope')
+
+def test_harvest_format_unexpectedvalueerror(api):
+    with pytest.raises(UnexpectedValueError):
+        api.scans.harvest('/tmp', format='nope')
+
 def test_host_details_scan_id_typeerror(api):
     with pytest.raises(TypeError):
         api.scans.host_details('nope', 1)
@@ -126,6 +206,18 @@ def test_import_scan_password_typeerror(api):
 def test_import_scan(api):
     pass
 
+def test_launch_queue_queue_typeerror(api):
+    with pytest.raises(TypeError):
+        api.scans.launch_queue('nope')
+
+def test_launch_queue_scan_id_typeerror(api):
+    with pytest.raises(TypeError):
+        api.scans.launch_queue([('nope', 1)])
+
+def test_launch_queue_max_per_scanner_typeerror(api):
+    with pytest.raises(TypeError):
+        api.scans.launch_queue([], max_per_scanner='nope')
+
 def test_list_folder_id_typeerror(api):
     with pytest.raises(TypeError):
         api.scans.list(folder_id='nope')
@@ -205,4 +297,18 @@ def test_stop(api):
     pass
 
 def test_timezones(api):
-    assert isinstance(api.scans.timezones(), list)
\ No newline at end of file
+    assert isinstance(api.scans.timezones(), list)
+
+def test_watcher_interval_typeerror(api):
+    with pytest.raises(TypeError):
+        api.scans.watcher(interval='nope')
+
+def test_watcher_poll(api):
+    watcher = api.scans.watcher()
+    for scan in api.scans.list()['scans'] or list():
+        watcher.watch(scan['id'])
+    changes = watcher.poll()
+    assert isinstance(changes, list)
+    for scan_id, old, new in changes:
+        assert old == None
+        assert watcher.status(scan_id) == new
@@ -0,0 +1,75 @@
+from .fixtures import *
+from tenable.errors import *
+
+def test_asset_vuln_info_uuid_typeerror(api):
+    with pytest.raises(TypeError):
+        api.workbenches.asset_vuln_info(1, 19506)
+
+def test_asset_vuln_info_plugin_id_typeerror(api):
+    with pytest.raises(TypeError):
+        api.workbenches.asset_vuln_info(str(uuid.uuid4()), 'nope')
+
+def test_asset_vuln_output_uuid_typeerror(api):
+    with pytest.raises(TypeError):
+        api.workbenches.asset_vuln_output(1, 19506)
+
+def test_asset_vuln_output_plugin_id_typeerror(api):
+    with pytest.raises(TypeError):
+        api.workbenches.asset_vuln_output(str(uuid.uuid4()), 'nope')
+
+def test_bulk_method_typeerror(api):
+    with pytest.raises(TypeError):
+        api.workbenches.bulk(1, [])
+
+def test_bulk_method_unexpectedvalueerror(api):
+    with pytest.raises(UnexpectedValueError):
+        api.workbenches.bulk('nope', [])
+
+def test_bulk_threads_typeerror(api):
+    with pytest.raises(TypeError):
+        api.workbenches.bulk('asset_info', [], threads='nope')
+
+def test_bulk_rate_typeerror(api):
+    with pytest.raises(TypeError):
+        api.workbenches.bulk('asset_info', [], rate='nope')
+
+def test_bulk_item_errors(api):
+    results = list(api.workbenches.bulk('asset_info', ['nope', 'nope']))
+    assert len(results) == 1
+    assert isinstance(results[0]['error'], UnexpectedValueError)
+
+def test_bulk_vuln_info(api):
+    vulns = api.workbenches.vulns()[:5]
+    plugins = [v['plugin_id'] for v in vulns] * 2
+    results = list(api.workbenches.bulk('vuln_info', plugins))
+    assert len(results) == len(set(plugins))
+    for item in results:
+        assert item['error'] == None
+        assert isinstance(item['result'], dict)
+
+def test_vuln_info_cached(api):
+    from tenable.utils import LRUCache
+    cache = LRUCache(maxsize=10, ttl=60)
+    cached = TenableIO(
+        os.environ['TIO_TEST_ADMIN_ACCESS'],
+        os.environ['TIO_TEST_ADMIN_SECRET'],
+        workbench_cache=cache)
+    plugin_id = api.workbenches.vulns()[0]['plugin_id']
+    info = cached.workbenches.vuln_info(plugin_id)
+    assert cached.workbenches.vuln_info(plugin_id) == info
+    assert cache.misses == 1
+    assert cache.hits == 1
+
+def test_export_records_format_unexpectedvalueerror(api):
+    with pytest.raises(UnexpectedValueError):
+        api.workbenches.export_records(format='pdf')
+
+def test_export_records_types_typeerror(api):
+    with pytest.raises(TypeError):
+        api.workbenches.export_records(format='csv', types='nope')
+
+def test_export_records_csv(api):
+    for row in api.workbenches.export_records(format='csv'):
+        assert isinstance(row, dict)
+        assert isinstance(row['Plugin ID'], int)
+        break
@@ -0,0 +1,159 @@
+from tenable.utils import (
+    threaded_map, RateLimiter, LRUCache, MultipartEncoder)
+import pytest, io, random, threading, time
+
+def wait_for(check, timeout=5):
+    end = time.time() + timeout
+    while not check():
+        assert time.time() < end
+        time.sleep(0.01)
+
+def test_threaded_map_ordered():
+    def slow(i):
+        time.sleep(random.random() / 100)
+        return i * 2
+    assert list(threaded_map(slow, range(50), workers=4)) == [
+        i * 2 for i in range(50)]
+
+def test_threaded_map_unordered():
+    assert sorted(threaded_map(lambda i: i, range(50), workers=4,
+        ordered=False)) == list(range(50))
+
+def test_threaded_map_exception():
+    def fail(i):
+        if i == 5:
+            raise ValueError(i)
+        return i
+    results = list()
+    with pytest.raises(ValueError):
+        for item in threaded_map(fail, range(20), workers=2):
+            results.append(item)
+    assert results == list(range(5))
+
+def test_rate_limiter_burst():
+    limiter = RateLimiter(20, burst=2)
+    start = time.time()
+    limiter.wait()
+    limiter.wait()
+    assert time.time() - start < 0.04
+    for i in range(4):
+        limiter.wait()
+    assert time.time() - start >= 0.18
+
+def test_rate_limiter_threads():
+    limiter = RateLimiter(50)
+    start = time.time()
+    threads = [threading.Thread(target=limiter.wait) for i in range(11)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    assert time.time() - start >= 0.18
+
+def test_lru_cache_hits_and_misses():
+    cache = LRUCache()
+    assert cache.get('a', lambda: 1) == 1
+    assert cache.get('a', lambda: 2) == 1
+    assert (cache.hits, cache.misses, cache.coalesced) == (1, 1, 0)
+    cache.clear()
+    assert len(cache) == 0
+    assert cache.get('a', lambda: 2) == 2
+
+def test_lru_cache_ttl():
+    cache = LRUCache(ttl=0.05)
+    assert cache.get('a', lambda: 1) == 1
+    assert cache.get('a', lambda: 2) == 1
+    time.sleep(0.1)
+    assert cache.get('a', lambda: 3) == 3
+    assert (cache.hits, cache.misses) == (1, 2)
+
+def test_lru_cache_eviction_order():
+    cache = LRUCache(maxsize=2)
+    cache.get('a', lambda: 1)
+    cache.get('b', lambda: 2)
+    cache.get('a', lambda: None)
+    cache.get('c', lambda: 3)
+    assert len(cache) == 2
+    assert cache.get('a', lambda: 4) == 1
+    assert cache.get('b', lambda: 5) == 5
+
+def test_lru_cache_coalesced():
+    cache = LRUCache()
+    release = threading.Event()
+    calls = list()
+    results = list()
+
+    def loader():
+        calls.append(1)
+        release.wait()
+        return 'value'
+
+    threads = [threading.Thread(
+        target=lambda: results.append(cache.get('a', loader)))
+        for i in range(3)]
+    for thread in threads:
+        thread.start()
+    wait_for(lambda: cache.coalesced == 2)
+    release.set()
+    for thread in threads:
+        thread.join()
+    assert results == ['value'] * 3
+    assert len(calls) == 1
+    assert (cache.hits, cache.misses, cache.coalesced) == (0, 1, 2)
+
+def test_lru_cache_error_propagation():
+    cache = LRUCache()
+    release = threading.Event()
+    errors = list()
+
+    def loader():
+        release.wait()
+        raise ValueError('boom')
+
+    def get():
+        try:
+            cache.get('a', loader)
+        except ValueError as err:
+            errors.append(err)
+
+    threads = [threading.Thread(target=get) for i in range(3)]
+    for thread in threads:
+        thread.start()
+    wait_for(lambda: cache.coalesced == 2)
+    release.set()
+    for thread in threads:
+        thread.join()
+    assert len(errors) == 3
+    assert len(cache) == 0
+    assert cache.get('a', lambda: 1) == 1
+
+def test_multipart_encoder_length():
+    fobj = io.BytesIO(b'skipped' + b'x' * 100000)
+    fobj.seek(7)
+    progress = list()
+    enc = MultipartEncoder([('name', 'value'), ('Filedata', ('a.txt', fobj))],
+        progress=lambda sent, total: progress.append((sent, total)))
+    body = enc.read()
+    assert len(body) == len(enc) == enc.len
+    assert b'\r\n\r\n' + b'x' * 100000 + b'\r\n--' in body
+    assert b'skipped' not in body
+    assert b'filename="a.txt"' in body
+    assert enc.content_type.endswith(body.split(b'\r\n')[0][2:].decode())
+    assert progress[-1] == (len(enc), len(enc))
+
+def test_multipart_encoder_seek():
+    enc = MultipartEncoder([('Filedata', io.BytesIO(b'0123456789' * 1000))])
+    body = enc.read()
+    assert enc.read() == b''
+    assert enc.seek(0) == 0
+    assert b''.join(iter(lambda: enc.read(333), b'')) == body
+    enc.seek(150)
+    assert enc.tell() == 150
+    assert enc.read(1000) == body[150:1150]
+    enc.seek(-10, 1)
+    assert enc.read(20) == body[1140:1160]
+    assert enc.seek(-5, 2) == len(enc) - 5
+    assert enc.read() == body[-5:]
+    assert b''.join(enc) == b''
+    enc.seek(0)
+    assert b''.join(enc) == body